@@ -0,0 +1,98 @@
+import json
+import warnings
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.functional import Promise
+from pydantic.json import pydantic_encoder
+
+__all__ = ["loads", "dumps"]
+
+
+class JSONBackend(NamedTuple):
+    loads: Callable[[Union[bytes, str]], Any]
+    # (obj, indent, ensure_ascii) -> bytes
+    dumps: Callable[[Any, Optional[int], bool], bytes]
+
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def default(obj: Any) -> Any:
+    """
+    Encode lazy translations as strings, then the types supported by
+    `DjangoJSONEncoder`, then the types supported by pydantic.
+    """
+    if isinstance(obj, Promise):
+        return str(obj)
+    try:
+        return _django_encoder.default(obj)
+    except TypeError:
+        return pydantic_encoder(obj)
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int], ensure_ascii: bool) -> bytes:
+    return json.dumps(
+        obj, indent=indent, ensure_ascii=ensure_ascii, default=default
+    ).encode("utf8")
+
+
+def _orjson_backend() -> JSONBackend:
+    import orjson
+
+    def dumps(obj: Any, indent: Optional[int], ensure_ascii: bool) -> bytes:
+        # orjson always outputs UTF-8 and only supports two-space indentation.
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    return JSONBackend(orjson.loads, dumps)
+
+
+def _ujson_backend() -> JSONBackend:
+    import ujson
+
+    def dumps(obj: Any, indent: Optional[int], ensure_ascii: bool) -> bytes:
+        return ujson.dumps(
+            obj, indent=indent or 0, ensure_ascii=ensure_ascii, default=default
+        ).encode("utf8")
+
+    return JSONBackend(ujson.loads, dumps)
+
+
+BACKENDS = {
+    "json": lambda: JSONBackend(json.loads, _stdlib_dumps),
+    "orjson": _orjson_backend,
+    "ujson": _ujson_backend,
+}
+
+
+@lru_cache(maxsize=None)
+def _get_backend(name: str) -> JSONBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"`DSA_JSON_BACKEND` must in {list(BACKENDS)}")
+    try:
+        return BACKENDS[name]()
+    except ImportError:
+        warnings.warn(
+            f"JSON backend `{name}` is not installed, use the standard library `json`."
+        )
+        return BACKENDS["json"]()
+
+
+def get_backend() -> JSONBackend:
+    """
+    The JSON backend selected by `DSA_JSON_BACKEND`, default to the standard library.
+    """
+    return _get_backend(getattr(settings, "DSA_JSON_BACKEND", "json"))
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any, *, indent: Any = None, ensure_ascii: bool = True) -> bytes:
+    return get_backend().dumps(obj, indent, ensure_ascii)
@@ -1,9 +1,27 @@
+from time import perf_counter
+
+from django.conf import settings
 from django.db import models
 from django.apps import AppConfig
+from django.http.request import HttpRequest
 
+from .timing import report_binding_timings
 from .utils import get_all_urls
+from .views import get_paths_docs
 from .params import parse_and_bound_params
-from .serialize import serialize_model, serialize_queryset
+from .parsers import (
+    get_request_data,
+    get_request_json,
+    set_request_data,
+    set_request_json,
+)
+from .serialize import (
+    aiter_serialize_queryset,
+    iter_serialize_queryset,
+    serialize_model,
+    serialize_queryset,
+    warm_up_key_converter,
+)
 
 
 class DjangoSimpleAPIConfig(AppConfig):
@@ -13,6 +31,25 @@ class DjangoSimpleAPIConfig(AppConfig):
         models.Model.to_json = serialize_model
         models.query.QuerySet.to_json = serialize_queryset
         models.query.RawQuerySet.to_json = serialize_queryset
+        models.query.QuerySet.iter_json = iter_serialize_queryset
+        models.query.RawQuerySet.iter_json = iter_serialize_queryset
+        models.query.QuerySet.aiter_json = aiter_serialize_queryset
+        models.query.RawQuerySet.aiter_json = aiter_serialize_queryset
+        warm_up_key_converter()
+
+        HttpRequest.JSON = property(get_request_json, set_request_json)
+        HttpRequest.DATA = property(get_request_data, set_request_data)
+
+        # Bind the parameters on the first dispatch instead, see `ensure_bound`.
+        if not getattr(settings, "DSA_LAZY_BINDING", False):
+            binding_timings = []
+            for url_format, http_handler in get_all_urls():
+                start = perf_counter()
+                parse_and_bound_params(http_handler)
+                binding_timings.append((url_format, perf_counter() - start))
+            report_binding_timings(binding_timings)
 
-        for url_format, http_handler in get_all_urls():
-            parse_and_bound_params(http_handler)
+        # Generate the documents in the master process of `gunicorn --preload`,
+        # so the forked workers share them.
+        if getattr(settings, "DSA_WARM_UP_DOCS", False):
+            get_paths_docs()
@@ -1,13 +1,36 @@
+import hashlib
+import json
 import sys
+from asyncio import iscoroutinefunction
+from functools import partial, wraps
 from http import HTTPStatus
 from inspect import isclass
-from typing import Any, Callable, Dict, List, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+from asgiref.sync import sync_to_async
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
 from django.views import View
 from pydantic import BaseModel, create_model
+from pydantic.json import pydantic_encoder
 from pydantic.utils import display_as_type
 
 from .extras import describe_extra_docs
+from .responses import ResponseSerializer
 
 if sys.version_info >= (3, 9):
     # https://www.python.org/dev/peps/pep-0585/
@@ -52,11 +75,16 @@ def describe_response(
     content: Union[Type[BaseModel], dict, type] = None,
     headers: dict = None,
     links: dict = None,
+    serialize: bool = False,
 ) -> Callable[[T], T]:
     """
     Describe a response in HTTP view function
 
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#responseObject
+
+    If `serialize` is true, the view can return a pydantic model, a dict, a list,
+    a Django model or a QuerySet instead of a response. It is validated against
+    `content` and encoded to a JSON response of the `status`.
     """
     status = int(status)
     if not description:
@@ -95,11 +123,37 @@ def describe_response(
         }
         responses[status] = {k: v for k, v in response.items() if v}
 
+        if serialize:
+            if hasattr(func, "__response_serializer__"):
+                raise RuntimeError(
+                    f"`{func.__qualname__}` already serializes the response of status "
+                    f"{getattr(func, '__response_serializer__').status}, cannot repeat the statement!"
+                )
+            model = real_content if isclass(real_content) else None
+            return _wrap_response_serializer(func, ResponseSerializer(status, model))
+
         return func
 
     return decorator
 
 
+def _wrap_response_serializer(func: T, serializer: ResponseSerializer) -> T:
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await serializer.acall(await func(*args, **kwargs))
+
+    else:
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return serializer(func(*args, **kwargs))
+
+    setattr(wrapper, "__response_serializer__", serializer)
+    return wrapper  # type: ignore
+
+
 def describe_responses(responses: Dict[int, dict]) -> Callable[[T], T]:
     """
     Describe responses in HTTP view function
@@ -122,3 +176,272 @@ def mark_tags(*tags: str) -> Callable[[T], T]:
         return describe_extra_docs(handler, {"tags": tags})
 
     return wrapper
+
+
+def _describe_not_modified(handler: T) -> T:
+    """
+    Describe the `If-None-Match` header and the `304` response in the documents.
+    """
+    handler = describe_response(304)(handler)
+    return describe_extra_docs(
+        handler,
+        {
+            "parameters": [
+                {
+                    "name": "If-None-Match",
+                    "in": "header",
+                    "required": False,
+                    "description": "The `ETag` of the cached response.",
+                    "schema": {"type": "string"},
+                }
+            ]
+        },
+    )
+
+
+def _split_request(args: Tuple[Any, ...]) -> Tuple[HttpRequest, Tuple[Any, ...]]:
+    # `(request, *args)` for functions, `(self, request, *args)` for methods.
+    if isinstance(args[0], HttpRequest):
+        return args[0], args[1:]
+    return args[1], args[2:]
+
+
+def _normalize(value: Any) -> Any:
+    return value.dict() if isinstance(value, BaseModel) else value
+
+
+def _add_etag(response: Any) -> bool:
+    """
+    Add the hash of the body as the `ETag` of a `200` response,
+    return whether the response has an `ETag`.
+    """
+    if not (isinstance(response, HttpResponse) and response.status_code == 200):
+        return False
+    if not response.has_header("ETag"):
+        response["ETag"] = quote_etag(hashlib.sha256(response.content).hexdigest())
+    return True
+
+
+def _decorate_view_class(view_class: Any, decorator: Callable[[T], T]) -> Any:
+    """
+    Decorate the `get` and `head` methods of the class view on the class itself,
+    inherited methods included.
+    """
+    methods = [method for method in ("get", "head") if hasattr(view_class, method)]
+    if not methods:
+        raise TypeError(f"`{view_class.__qualname__}` has no `get` or `head` method.")
+    for method in methods:
+        setattr(view_class, method, decorator(getattr(view_class, method)))
+    return view_class
+
+
+def _is_unrendered(response: Any) -> bool:
+    # The body of a `TemplateResponse` is only available once it is rendered.
+    return hasattr(response, "add_post_render_callback") and not response.is_rendered
+
+
+def _conditional(request: HttpRequest, response: Any) -> Any:
+    # The return value of a view decorated by `describe_response(serialize=True)`
+    # below this decorator is not a response yet.
+    if not isinstance(response, HttpResponseBase) or not response.has_header("ETag"):
+        return response
+    return get_conditional_response(request, etag=response["ETag"], response=response)
+
+
+def cache_response(
+    ttl: int,
+    vary_on: Sequence[str] = (),
+    *,
+    cache_alias: str = DEFAULT_CACHE_ALIAS,
+    key_prefix: str = "dsa.cache_response",
+) -> Callable[[T], T]:
+    """
+    Cache the `200` responses of `GET` and `HEAD` requests in Django's cache
+    for `ttl` seconds, and respond `304` if the `ETag` matches `If-None-Match`.
+
+    The cache key is built from the validated parameters of the view and the
+    request headers in `vary_on`, so `?a=1&b=2` and `?b=2&a=1` share a response.
+    Undeclared parameters read from the request directly, the user, the session
+    and the `Vary` headers added by middleware are not in the key.
+
+    Put it above `describe_response(serialize=True)`, only responses are cached.
+    """
+
+    def make_key(
+        func: Callable, request: HttpRequest, args: Tuple, kwargs: Dict
+    ) -> str:
+        params = {
+            "args": [_normalize(arg) for arg in args],
+            "kwargs": {name: _normalize(value) for name, value in kwargs.items()},
+            "vary_on": [request.headers.get(header) for header in vary_on],
+        }
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=pydantic_encoder).encode("utf8")
+        ).hexdigest()
+        return f"{key_prefix}.{func.__module__}.{func.__qualname__}.{digest}"
+
+    def prepare(response: HttpResponseBase) -> bool:
+        """
+        Add `ETag` and `Vary` to the response, return whether it can be cached.
+        """
+        if not _add_etag(response):
+            return False
+        patch_vary_headers(response, vary_on)
+        return True
+
+    def store(request: HttpRequest, key: str, response: HttpResponseBase) -> Any:
+        if prepare(response):
+            caches[cache_alias].set(key, response, ttl)
+        return _conditional(request, response)
+
+    def decorator(func: T) -> T:
+        if isclass(func) and issubclass(func, View):
+            return _decorate_view_class(func, decorator)
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                request, rest_args = _split_request(args)
+                if request.method not in ("GET", "HEAD"):
+                    return await func(*args, **kwargs)
+
+                cache = caches[cache_alias]
+                key = make_key(func, request, rest_args, kwargs)
+                response = await sync_to_async(cache.get)(key)
+                if response is not None:
+                    return _conditional(request, response)
+
+                response = await func(*args, **kwargs)
+                if _is_unrendered(response):
+                    # Like `cache_page`, cache it once it is rendered, which
+                    # Django does in a thread.
+                    response.add_post_render_callback(partial(store, request, key))
+                    return response
+                if prepare(response):
+                    await sync_to_async(cache.set)(key, response, ttl)
+                return _conditional(request, response)
+
+        else:
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                request, rest_args = _split_request(args)
+                if request.method not in ("GET", "HEAD"):
+                    return func(*args, **kwargs)
+
+                key = make_key(func, request, rest_args, kwargs)
+                response = caches[cache_alias].get(key)
+                if response is not None:
+                    return _conditional(request, response)
+
+                response = func(*args, **kwargs)
+                if _is_unrendered(response):
+                    # Like `cache_page`, cache it once it is rendered.
+                    response.add_post_render_callback(partial(store, request, key))
+                    return response
+                return store(request, key, response)
+
+        return _describe_not_modified(wrapper)  # type: ignore
+
+    return decorator
+
+
+def conditional_response(
+    version: Optional[Callable[..., Any]] = None,
+) -> Callable[[T], T]:
+    """
+    Add an `ETag` to the `200` responses of `GET` and `HEAD` requests,
+    and respond `304` if it matches `If-None-Match`.
+
+    By default the `ETag` is the hash of the response body, which saves the
+    bandwidth but not the work of the view. If `version` is given, it is called
+    with the request and the validated parameters of the view before the view,
+    and the `ETag` is the hash of what it returns, so that an unchanged
+    resource is answered without calling the view. If it returns `None`, the
+    hash of the body is used.
+    """
+
+    # In async views, a sync `version` may query the database, so it is called in
+    # a thread.
+    aversion = (
+        version
+        if version is None or iscoroutinefunction(version)
+        else sync_to_async(version)
+    )
+
+    def make_etag(value: Any) -> str:
+        return quote_etag(
+            hashlib.sha256(
+                json.dumps(
+                    _normalize(value), sort_keys=True, default=pydantic_encoder
+                ).encode("utf8")
+            ).hexdigest()
+        )
+
+    def not_modified(request: HttpRequest, etag: str) -> Optional[HttpResponseBase]:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response["ETag"] = etag
+        return response
+
+    def finish(
+        request: HttpRequest, response: HttpResponseBase, etag: Optional[str]
+    ) -> Any:
+        if not isinstance(response, HttpResponseBase):
+            return response
+        if etag is not None:
+            if response.status_code == 200 and not response.has_header("ETag"):
+                response["ETag"] = etag
+            return response
+        if _is_unrendered(response):
+            # The body is hashed once it is rendered, the `304` returned by the
+            # callback replaces the response.
+            response.add_post_render_callback(partial(finish, request, etag=None))
+            return response
+        _add_etag(response)
+        return _conditional(request, response)
+
+    def decorator(func: T) -> T:
+        if isclass(func) and issubclass(func, View):
+            return _decorate_view_class(func, decorator)
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                request, rest_args = _split_request(args)
+                if request.method not in ("GET", "HEAD"):
+                    return await func(*args, **kwargs)
+
+                etag = None
+                if aversion is not None:
+                    value = await aversion(request, *rest_args, **kwargs)
+                    if value is not None:
+                        etag = make_etag(value)
+                        response = not_modified(request, etag)
+                        if response is not None:
+                            return response
+                return finish(request, await func(*args, **kwargs), etag)
+
+        else:
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                request, rest_args = _split_request(args)
+                if request.method not in ("GET", "HEAD"):
+                    return func(*args, **kwargs)
+
+                etag = None
+                if version is not None:
+                    value = version(request, *rest_args, **kwargs)
+                    if value is not None:
+                        etag = make_etag(value)
+                        response = not_modified(request, etag)
+                        if response is not None:
+                            return response
+                return finish(request, func(*args, **kwargs), etag)
+
+        return _describe_not_modified(wrapper)  # type: ignore
+
+    return decorator
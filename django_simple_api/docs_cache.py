@@ -0,0 +1,98 @@
+import hashlib
+import json
+from functools import lru_cache
+from inspect import Parameter, isclass, signature
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from pydantic import BaseModel, schema_of
+from pydantic.fields import FieldInfo
+
+from . import _json
+from .__version__ import __version__
+from .utils import is_class_view
+
+# (path item of the OpenAPI document, definitions)
+Fragment = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def _describe_function(function: Any) -> List[str]:
+    sig = signature(function)
+    parts = [
+        function.__module__,
+        function.__qualname__,
+        repr(function.__doc__),
+        repr(getattr(function, "__method__", None)),
+        repr(getattr(function, "__responses__", None)),
+        repr(getattr(function, "__extra_docs__", None)),
+        str(sig),
+    ]
+    annotations = [
+        param.annotation
+        for param in sig.parameters.values()
+        if isinstance(param.default, FieldInfo)
+    ]
+    annotations.extend(
+        info.get("content") for info in getattr(function, "__responses__", {}).values()
+    )
+    # The signature only contains the name of the models, the schema contains
+    # the fields of the nested models as well.
+    parts.extend(_describe_annotation(annotation) for annotation in annotations)
+    return parts
+
+
+def _describe_annotation(annotation: Any) -> str:
+    if annotation is Parameter.empty or annotation is None:
+        return ""
+    if isinstance(annotation, (dict, str)):
+        # Described in `__responses__` already.
+        return ""
+    try:
+        if isclass(annotation) and issubclass(annotation, BaseModel):
+            schema = annotation.schema()
+        else:
+            schema = schema_of(annotation)
+    except (TypeError, ValueError, RuntimeError):
+        # Types that have no schema.
+        return repr(annotation)
+    return json.dumps(schema, sort_keys=True, default=str)
+
+
+def get_cache_key(handler: Any) -> str:
+    """
+    The key of the documents of the handler, a hash of its qualname, signature,
+    annotations and the documents described by the decorators.
+    """
+    if is_class_view(handler):
+        view_class = handler.view_class
+        parts = [view_class.__module__, view_class.__qualname__]
+        for method in view_class.http_method_names:
+            if hasattr(view_class, method) and method != "options":
+                parts.append(method)
+                parts.extend(_describe_function(getattr(view_class, method)))
+    else:
+        parts = _describe_function(handler)
+    parts.append(__version__)
+    return hashlib.sha256("\0".join(parts).encode("utf8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_docs_cache() -> Optional[Dict[str, Fragment]]:
+    """
+    Load the fragments written by `manage.py cache_openapi` to `DSA_DOCS_CACHE`,
+    `None` if it is not configured or not written yet.
+    """
+    cache_path = getattr(settings, "DSA_DOCS_CACHE", None)
+    if cache_path is None or not Path(cache_path).exists():
+        return None
+    return {
+        key: (path_item, definitions)
+        for key, (path_item, definitions) in _json.loads(
+            Path(cache_path).read_bytes()
+        ).items()
+    }
+
+
+def dump_docs_cache(cache_path: str, fragments: Dict[str, Fragment]) -> None:
+    Path(cache_path).write_bytes(_json.dumps(fragments, ensure_ascii=False))
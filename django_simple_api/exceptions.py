@@ -1,8 +1,9 @@
-import json
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
+from django.core.exceptions import SuspiciousOperation
 from pydantic import ValidationError
-from pydantic.json import pydantic_encoder
+
+from ._json import dumps
 
 
 class ExclusiveFieldError(Exception):
@@ -13,15 +14,28 @@ class ExclusiveFieldError(Exception):
         return self.message
 
 
+class JSONParseError(SuspiciousOperation):
+    # Django responds `400` to `SuspiciousOperation`, `BadRequest` requires Django 3.2.
+    pass
+
+
 class RequestValidationError(Exception):
-    def __init__(self, validation_error: ValidationError) -> None:
+    def __init__(
+        self,
+        validation_error: ValidationError,
+        *,
+        errors: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
         self.validation_error = validation_error
+        self._errors = errors
 
     def errors(self) -> List[Dict[str, Any]]:
+        if self._errors is not None:
+            return self._errors
         return self.validation_error.errors()
 
     def json(self, *, indent: Union[None, int, str] = 2) -> str:
-        return json.dumps(self.errors(), indent=indent, default=pydantic_encoder)
+        return dumps(self.errors(), indent=indent).decode("utf8")
 
     @staticmethod
     def schema() -> dict:
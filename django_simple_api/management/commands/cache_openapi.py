@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...docs_cache import dump_docs_cache, get_cache_key
+from ...params import ensure_bound
+from ...utils import get_all_urls
+from ...views import _generate_path_docs
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI document of each view to `DSA_DOCS_CACHE`, so that "
+        "the processes don't generate them again. Run it when deploying, "
+        "like `collectstatic`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=getattr(settings, "DSA_DOCS_CACHE", None),
+            help="The file to write, default to `DSA_DOCS_CACHE`.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        if output is None:
+            raise CommandError("Please set `DSA_DOCS_CACHE` or use `--output`.")
+
+        fragments = {}
+        for _, view in get_all_urls():
+            ensure_bound(view)
+            fragments[get_cache_key(view)] = _generate_path_docs(view)
+        dump_docs_cache(output, fragments)
+        self.stdout.write(f"Cached the documents of {len(fragments)} views to {output}")
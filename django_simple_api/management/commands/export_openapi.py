@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ..._json import default
+from ...views import generate_openapi_docs, generate_paths_docs
+
+
+class Command(BaseCommand):
+    help = "Export the OpenAPI document of all urls to a JSON or YAML file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="The file to write, default to stdout.",
+        )
+        parser.add_argument(
+            "-f",
+            "--format",
+            choices=["json", "yaml"],
+            help="Default to `yaml` if the output file ends with `.yaml` or `.yml`, otherwise `json`.",
+        )
+        parser.add_argument("--title", default="Django Simple API")
+        parser.add_argument(
+            "--description", default="This is description of your API document."
+        )
+        parser.add_argument("--api-version", default="0.1.0")
+        parser.add_argument(
+            "--server",
+            action="append",
+            default=[],
+            help="The url of an API server, can be used multiple times.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        output_format = options["format"]
+        if output_format is None:
+            output_format = (
+                "yaml" if output and output.endswith((".yaml", ".yml")) else "json"
+            )
+
+        openapi_docs = generate_openapi_docs(
+            options["title"],
+            options["description"],
+            options["api_version"],
+            servers=[{"url": url} for url in options["server"]],
+        )
+        openapi_docs["paths"], openapi_docs["definitions"] = generate_paths_docs()
+
+        content = json.dumps(
+            openapi_docs,
+            indent=2,
+            sort_keys=True,
+            ensure_ascii=False,
+            default=default,
+        )
+        if output_format == "yaml":
+            try:
+                import yaml
+            except ImportError:
+                raise CommandError("Please install `PyYAML` to export YAML.")
+
+            # Dump the JSON data, so that the YAML document is the same as the JSON one.
+            content = yaml.safe_dump(
+                json.loads(content), sort_keys=True, allow_unicode=True
+            )
+
+        if output:
+            with open(output, "w", encoding="utf8") as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
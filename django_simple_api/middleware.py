@@ -1,7 +1,8 @@
-import json
 from http import HTTPStatus
 from typing import Any, Callable, Dict, List, Optional
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.http.request import HttpRequest
 from django.http.response import (
     HttpResponse,
@@ -10,38 +11,95 @@ from django.http.response import (
 )
 from django.utils.deprecation import MiddlewareMixin
 
-from .exceptions import RequestValidationError
-from .params import verify_params
-from .utils import merge_query_dict
+try:
+    from asgiref.sync import iscoroutinefunction
+except ImportError:  # asgiref < 3.6
+    from asyncio import iscoroutinefunction  # type: ignore
+
+from .exceptions import JSONParseError, RequestValidationError
+from .params import get_request_handler, verify_params
+from .parsers import get_request_data, is_body_on_disk
+from .timing import report_timings, timed
 
 
 class ParseRequestDataMiddleware(MiddlewareMixin):
-    def process_request(self, request: HttpRequest) -> HttpResponse:
-        request.JSON = None
-        if request.content_type == "application/json":
-            try:
-                request.JSON = json.loads(request.body)
-            except ValueError as ve:
-                return HttpResponseBadRequest(
-                    "Unable to parse JSON data. Error: {0}".format(ve)
-                )
-            request.DATA = request.JSON
-        else:
-            if request.method not in ("GET", "POST"):
-                # if you want to know why do that,
-                # read https://aber.sh/articles/Django-Parse-non-POST-Request/
-                if hasattr(request, "_post"):
-                    del request._post
-                    del request._files
-
-                _shadow = request.method
-                request.method = "POST"
-                request._load_post_and_files()
-                request.method = _shadow
-            request.DATA = dict(
-                **merge_query_dict(request.POST), **merge_query_dict(request.FILES)
+    """
+    `request.JSON` and `request.DATA` are parsed lazily. This middleware parses
+    them before the view is called, only if the view declares `Body` parameters,
+    so other views never pay for parsing the body.
+
+    Both sync and async capable. In async mode, coroutine views are processed
+    in the event loop, and only the blocking parsing of forms and bodies spooled
+    to disk is moved to a thread. Sync views and their validators may touch the
+    database, so they are processed in a thread by `sync_to_async`.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        super().__init__(get_response)
+        # Django calls `process_view` through `sync_to_async` in async mode,
+        # unless it is a coroutine function.
+        if iscoroutinefunction(self.get_response):
+            self.process_view = self.aprocess_view  # type: ignore
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = None
+        if hasattr(self, "process_request"):
+            response = await sync_to_async(self.process_request)(request)
+        response = response or await self.get_response(request)
+        # The receivers of `request_timing` may block, so the timings are
+        # reported in a thread like Django runs `process_response`.
+        if getattr(request, "_timings", None) or (
+            type(self).process_response
+            is not ParseRequestDataMiddleware.process_response
+        ):
+            return await sync_to_async(self.process_response)(request, response)
+        return self.process_response(request, response)
+
+    async def aprocess_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: List[Any],
+        view_kwargs: Dict[str, Any],
+    ) -> Optional[HttpResponse]:
+        handler = get_request_handler(view_func, request)
+        if not iscoroutinefunction(handler):
+            return await sync_to_async(type(self).process_view)(
+                self, request, view_func, view_args, view_kwargs
             )
 
+        # Only a JSON body in memory is decoded in the event loop.
+        if hasattr(handler, "__request_body__") and (
+            is_body_on_disk(request) or request.content_type != "application/json"
+        ):
+            try:
+                await sync_to_async(get_request_data)(request)
+            except JSONParseError as error:
+                return HttpResponseBadRequest(str(error))
+
+        return type(self).process_view(self, request, view_func, view_args, view_kwargs)
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: List[Any],
+        view_kwargs: Dict[str, Any],
+    ) -> Optional[HttpResponse]:
+        if hasattr(get_request_handler(view_func, request), "__request_body__"):
+            try:
+                get_request_data(request)
+            except JSONParseError as error:
+                return HttpResponseBadRequest(str(error))
+        return None
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        # Report the timings recorded if `DSA_TIMING` is enabled.
+        report_timings(request, response)
+        return response
+
 
 class ValidateRequestDataMiddleware(ParseRequestDataMiddleware):
     def process_view(
@@ -62,14 +120,21 @@ class ValidateRequestDataMiddleware(ParseRequestDataMiddleware):
             view_kwargs.update(verify_params(view_func, request, view_kwargs))
             return None
         except RequestValidationError as error:
-            return self.process_validation_error(error)
+            with timed(request, "render-422") as timer:
+                response = self.process_validation_error(error)
+                timer.size = len(response.content)
+            return response
+        except JSONParseError as error:
+            return HttpResponseBadRequest(str(error))
 
     @staticmethod
     def process_validation_error(
         validation_error: RequestValidationError,
     ) -> HttpResponse:
         return HttpResponse(
-            validation_error.json(),
+            validation_error.json(
+                indent=getattr(settings, "DSA_VALIDATION_ERROR_INDENT", 2)
+            ),
             content_type="application/json",
             status=HTTPStatus.UNPROCESSABLE_ENTITY,
         )
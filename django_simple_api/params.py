@@ -1,14 +1,351 @@
+import threading
+from copy import copy
 from inspect import isclass, signature
-from typing import Any, Callable, Dict, List, TypeVar
-
-from django.http.request import HttpRequest
-from pydantic import BaseModel, ValidationError, create_model
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from weakref import WeakSet
+
+from django.conf import settings
+from django.http.request import HttpHeaders, HttpRequest
+from pydantic import BaseModel, Extra, Field, ValidationError, create_model
+from pydantic.fields import (
+    SHAPE_DEQUE,
+    SHAPE_FROZENSET,
+    SHAPE_ITERABLE,
+    SHAPE_LIST,
+    SHAPE_SEQUENCE,
+    SHAPE_SET,
+    SHAPE_TUPLE,
+    SHAPE_TUPLE_ELLIPSIS,
+    ModelField,
+)
 
 from ._fields import FieldInfo
 from .exceptions import RequestValidationError, ExclusiveFieldError
-from .utils import is_class_view, merge_query_dict
+from .timing import Timer, get_timings, timed
+from .utils import LRUCache, is_class_view, merge_query_dict
 
 HTTPHandler = TypeVar("HTTPHandler", bound=Callable)
+Extractor = Callable[[HttpRequest, Dict[str, Any]], Any]
+
+
+def _extract_path(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    return path_params
+
+
+def _extract_query(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    return merge_query_dict(request.GET)
+
+
+def _extract_header(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    return request.headers
+
+
+def _extract_cookie(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    return request.COOKIES
+
+
+def _extract_body(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    return request.DATA  # type: ignore
+
+
+EXTRACTORS: Dict[str, Extractor] = {
+    "path": _extract_path,
+    "query": _extract_query,
+    "header": _extract_header,
+    "cookie": _extract_cookie,
+    "body": _extract_body,
+}
+
+
+def _declared_fields(
+    model: Type[BaseModel],
+) -> Optional[Tuple[Tuple[str, ModelField], ...]]:
+    """
+    The keys that the model reads from the data and their fields, `None` if
+    it allows or forbids extra keys, which needs the whole data.
+    """
+    config = model.__config__
+    if config.extra != Extra.ignore:
+        return None
+    fields: List[Tuple[str, ModelField]] = []
+    for field in model.__fields__.values():
+        fields.append((field.alias, field))
+        if config.allow_population_by_field_name and field.name != field.alias:
+            fields.append((field.name, field))
+    return tuple(fields)
+
+
+SEQUENCE_SHAPES = {
+    SHAPE_LIST,
+    SHAPE_SET,
+    SHAPE_FROZENSET,
+    SHAPE_TUPLE,
+    SHAPE_TUPLE_ELLIPSIS,
+    SHAPE_SEQUENCE,
+    SHAPE_DEQUE,
+    SHAPE_ITERABLE,
+}
+
+
+def _compile_query_extractor(fields: Tuple[Tuple[str, ModelField], ...]) -> Extractor:
+    # (key, whether the field is a sequence such as `List[int]`)
+    keys = tuple((key, field.shape in SEQUENCE_SHAPES) for key, field in fields)
+
+    def extract(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+        query = request.GET
+        data = {}
+        for key, is_sequence in keys:
+            values = query.getlist(key)
+            if values:
+                # Like `merge_query_dict`, unless the field is a sequence.
+                data[key] = values if is_sequence or len(values) > 1 else values[0]
+        return data
+
+    return extract
+
+
+def _compile_header_extractor(fields: Tuple[Tuple[str, ModelField], ...]) -> Extractor:
+    # (header name, key of `request.META`), `request.headers` is built from it.
+    meta_keys: List[Tuple[str, str]] = []
+    for key, _ in fields:
+        # The names in `request.headers` never contain "_".
+        if "_" in key:
+            continue
+        meta_key = key.upper().replace("-", "_")
+        if meta_key not in HttpHeaders.UNPREFIXED_HEADERS:
+            meta_key = HttpHeaders.HTTP_PREFIX + meta_key
+        meta_keys.append((key, meta_key))
+
+    def extract(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+        meta = request.META
+        return {key: meta[meta_key] for key, meta_key in meta_keys if meta_key in meta}
+
+    return extract
+
+
+def _compile_cookie_extractor(fields: Tuple[Tuple[str, ModelField], ...]) -> Extractor:
+    keys = tuple(key for key, _ in fields)
+
+    def extract(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+        cookies = request.COOKIES
+        return {key: cookies[key] for key in keys if key in cookies}
+
+    return extract
+
+
+EXTRACTOR_COMPILERS: Dict[
+    str, Callable[[Tuple[Tuple[str, ModelField], ...]], Extractor]
+] = {
+    "query": _compile_query_extractor,
+    "header": _compile_header_extractor,
+    "cookie": _compile_cookie_extractor,
+}
+
+
+def get_extractor(location: str, model: Type[BaseModel]) -> Extractor:
+    """
+    The query, headers and cookies are only extracted for the keys declared
+    in the model.
+    """
+    if location in EXTRACTOR_COMPILERS:
+        fields = _declared_fields(model)
+        if fields is not None:
+            return EXTRACTOR_COMPILERS[location](fields)
+    return EXTRACTORS[location]
+
+
+class ValidationStep(NamedTuple):
+    location: str
+    model: Type[BaseModel]
+    extract: Extractor
+    # The name of the argument that receives the whole model (exclusive mode),
+    # `None` means that the fields of the model are the arguments.
+    bind_to: Optional[str]
+    # The validated models by the raw data, see `_get_validation_cache`.
+    cache: Optional[LRUCache] = None
+    # The fields that contain models, they are converted to dicts when the fields
+    # of the model are the arguments, see `_nested_model_fields`.
+    nested: FrozenSet[str] = frozenset()
+
+
+def _contains_model(field: ModelField) -> bool:
+    if isclass(field.type_) and issubclass(field.type_, BaseModel):
+        return True
+    return any(_contains_model(sub_field) for sub_field in field.sub_fields or ())
+
+
+def _nested_model_fields(model: Type[BaseModel]) -> FrozenSet[str]:
+    """
+    The fields of the model whose values contain models. Like `.dict()`, only
+    they need to be converted, the other values are read from `__dict__`.
+    """
+    return frozenset(
+        name for name, field in model.__fields__.items() if _contains_model(field)
+    )
+
+
+def _bind_fields(instance: BaseModel, nested: FrozenSet[str]) -> Dict[str, Any]:
+    if not nested:
+        return instance.__dict__
+    return {**instance.__dict__, **instance.dict(include=nested)}
+
+
+def _path_cache_key(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    key = tuple(path_params.items())
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _query_cache_key(request: HttpRequest, path_params: Dict[str, Any]) -> Any:
+    return request.META.get("QUERY_STRING", "")
+
+
+CACHE_KEYS: Dict[str, Extractor] = {
+    "path": _path_cache_key,
+    "query": _query_cache_key,
+}
+
+
+def _get_validation_cache(
+    location: str, model: Type[BaseModel], exclusive: bool
+) -> Optional[LRUCache]:
+    """
+    With `DSA_VALIDATION_CACHE_SIZE`, the path and query models declared frozen
+    (exclusive mode) are cached by the raw path parameters or query string,
+    the same input is not validated again.
+    """
+    size = getattr(settings, "DSA_VALIDATION_CACHE_SIZE", 0)
+    if not size or not exclusive or location not in CACHE_KEYS:
+        return None
+    config = model.__config__
+    if not (getattr(config, "frozen", False) or not config.allow_mutation):
+        return None
+    return LRUCache(size)
+
+
+class ValidationPlan:
+    """
+    The precompiled validation steps of a handler. It is created once by
+    `parse_and_bound_params`, so that each request only needs to extract
+    the data, validate it and bind it to the arguments.
+    """
+
+    __slots__ = ("steps",)
+
+    def __init__(self, steps: Iterable[ValidationStep]) -> None:
+        self.steps = tuple(steps)
+
+    def __call__(
+        self, request: HttpRequest, path_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {}
+        timings = get_timings(request)
+        try:
+            for location, model, extract, bind_to, cache, nested in self.steps:
+                cache_key = instance = None
+                if cache is not None:
+                    cache_key = CACHE_KEYS[location](request, path_params)
+                    if cache_key is not None:
+                        instance = cache.get(cache_key)
+
+                if instance is None:
+                    data = extract(request, path_params)
+                    with Timer(timings, f"validate-{location}", None):
+                        instance = model.parse_obj(data)
+                    if cache_key is not None:
+                        cache.set(cache_key, instance)  # type: ignore
+                if bind_to is None:
+                    kwargs.update(_bind_fields(instance, nested))
+                else:
+                    kwargs[bind_to] = instance
+        except ValidationError as e:
+            raise RequestValidationError(e)
+        return kwargs
+
+
+class MergedValidationPlan:
+    """
+    Validate all parameter locations of a handler in a single pass through one
+    composite model, whose field aliases are prefixed with the location.
+
+    The `loc` of the errors is restored to what `ValidationPlan` would report.
+    """
+
+    __slots__ = ("model", "sources", "locations", "fallback", "nested")
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        sources: Iterable[Tuple[str, Extractor, Optional[Tuple[Tuple[str, str], ...]]]],
+        locations: Dict[str, Tuple[str, Tuple[str, ...]]],
+        fallback: ValidationPlan,
+        nested: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.model = model
+        # (location, extractor, ((alias, composite alias), ...) or None for exclusive model)
+        self.sources = tuple(sources)
+        # composite alias -> (location, the `loc` prefix reported by `ValidationPlan`)
+        self.locations = locations
+        # `parse_obj` reports non-mapping data in its own way, leave it to `ValidationPlan`
+        self.fallback = fallback
+        # the fields of the non-exclusive parameters that contain models
+        self.nested = nested
+
+    def __call__(
+        self, request: HttpRequest, path_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for key, extract, aliases in self.sources:
+            source = extract(request, path_params)
+            if not isinstance(source, dict):
+                if not isinstance(source, Mapping):
+                    return self.fallback(request, path_params)
+                source = dict(source)
+
+            if aliases is None:
+                data[key] = source
+                continue
+
+            for alias, composite_alias in aliases:
+                if alias in source:
+                    data[composite_alias] = source[alias]
+
+        try:
+            with timed(request, "validate"):
+                return _bind_fields(self.model.parse_obj(data), self.nested)
+        except ValidationError as e:
+            raise RequestValidationError(e, errors=self.restore_errors(e.errors()))
+
+    def restore_errors(self, errors: List[Any]) -> List[Dict[str, Any]]:
+        # `ValidationPlan` stops at the first location that fails to validate.
+        first_location = None
+        restored = []
+        for error in errors:
+            location, loc = self.locations[error["loc"][0]]
+            if first_location is None:
+                first_location = location
+            elif location != first_location:
+                break
+            error["loc"] = loc + error["loc"][1:]
+            restored.append(error)
+        return restored
 
 
 def verify_params(
@@ -17,17 +354,52 @@ def verify_params(
     """
     Verify the parameters, and convert the parameters to the corresponding type.
     """
+    return _verify_params(
+        get_request_handler(handler, request), request, may_path_params
+    )
+
+
+def get_request_handler(handler: Any, request: HttpRequest) -> Any:
+    """
+    Get the function that handles the request, it is the method of the class view.
+    """
+    ensure_bound(handler)
     if is_class_view(handler):
-        return _verify_params(
-            getattr(
-                handler.view_class,
-                request.method.lower(),
-                handler.view_class.http_method_not_allowed,
-            ),
-            request,
-            may_path_params,
+        return getattr(
+            handler.view_class,
+            request.method.lower(),  # type: ignore
+            handler.view_class.http_method_not_allowed,
         )
-    return _verify_params(handler, request, may_path_params)
+    return handler
+
+
+_bind_lock = threading.Lock()
+# The handlers whose parameters are bound. Attributes can't be set on bound
+# methods, so they are recorded by their function.
+_bound_handlers: "WeakSet[Any]" = WeakSet()
+# The handlers that can't be weakly referenced.
+_bound_handlers_strong: Set[Any] = set()
+
+
+def _unbound(handler: Any) -> Any:
+    return getattr(handler, "__func__", handler)
+
+
+def is_bound(handler: Any) -> bool:
+    handler = _unbound(handler)
+    return handler in _bound_handlers or handler in _bound_handlers_strong
+
+
+def ensure_bound(handler: Any) -> None:
+    """
+    Bind the parameters of the handler if it has not been bound, for example
+    on the first dispatch when `DSA_LAZY_BINDING` is enabled.
+    """
+    if is_bound(handler):
+        return
+    with _bind_lock:
+        if not is_bound(handler):
+            parse_and_bound_params(handler)
 
 
 def parse_and_bound_params(handler: Any) -> None:
@@ -44,10 +416,18 @@ def parse_and_bound_params(handler: Any) -> None:
             )
     else:
         _parse_and_bound_params(handler)
+    # Record at last, other threads in `ensure_bound` only skip the lock once
+    # all the properties are bound.
+    try:
+        _bound_handlers.add(_unbound(handler))
+    except TypeError:
+        _bound_handlers_strong.add(_unbound(handler))
 
 
 def _parse_and_bound_params(handler: HTTPHandler) -> HTTPHandler:
     sig = signature(handler)
+    # The properties of a bound method are read from its function.
+    target = _unbound(handler)
 
     __parameters__: Dict[str, Any] = {
         "path": {},
@@ -56,7 +436,7 @@ def _parse_and_bound_params(handler: HTTPHandler) -> HTTPHandler:
         "cookie": {},
         "body": {},
     }
-    __exclusive_models__ = {}
+    __exclusive_names__: Dict[str, str] = {}
 
     for name, param in sig.parameters.items():
         default = param.default
@@ -79,7 +459,7 @@ def _parse_and_bound_params(handler: HTTPHandler) -> HTTPHandler:
                 )
 
             __parameters__[default._in] = annotation
-            __exclusive_models__[annotation] = name
+            __exclusive_names__[default._in] = name
             continue
 
         if isclass(__parameters__[default._in]) and issubclass(
@@ -95,6 +475,8 @@ def _parse_and_bound_params(handler: HTTPHandler) -> HTTPHandler:
         else:
             __parameters__[default._in][name] = default
 
+    definitions = dict(__parameters__)
+
     for key in tuple(__parameters__.keys()):
         _params_ = __parameters__.pop(key)
         # _params_ is subclass of BaseModel
@@ -107,58 +489,84 @@ def _parse_and_bound_params(handler: HTTPHandler) -> HTTPHandler:
         else:
             continue
 
+    if __parameters__:
+        setattr(
+            target,
+            "__validation_plan__",
+            _compile_validation_plan(definitions, __parameters__, __exclusive_names__),
+        )
+
     if "body" in __parameters__:
-        setattr(handler, "__request_body__", __parameters__.pop("body"))
+        setattr(target, "__request_body__", __parameters__.pop("body"))
 
     if __parameters__:
-        setattr(handler, "__parameters__", __parameters__)
-
-    if __exclusive_models__:
-        setattr(handler, "__exclusive_models__", __exclusive_models__)
+        setattr(target, "__parameters__", __parameters__)
 
     return handler
 
 
-def _verify_params(
-    handler: HTTPHandler, request: HttpRequest, may_path_params: Dict[str, Any]
-) -> Dict[str, Any]:
-    parameters = getattr(handler, "__parameters__", None)
-    request_body = getattr(handler, "__request_body__", None)
-    exclusive_models = getattr(handler, "__exclusive_models__", {})
-    if not (parameters or request_body or exclusive_models):
-        return {}
-
-    data: List[Any] = []
-    kwargs: Dict[str, Any] = {}
-    try:
-        # try to get parameters model and parse
-        if parameters:
-            if "path" in parameters:
-                data.append(parameters["path"].parse_obj(may_path_params))
-
-            if "query" in parameters:
-                data.append(
-                    parameters["query"].parse_obj(merge_query_dict(request.GET))
-                )
-
-            if "header" in parameters:
-                data.append(parameters["header"].parse_obj(request.headers))
+def _compile_validation_plan(
+    definitions: Dict[str, Any],
+    models: Dict[str, Type[BaseModel]],
+    exclusive_names: Dict[str, str],
+) -> Any:
+    extractors = {key: get_extractor(key, model) for key, model in models.items()}
+    validation_plan = ValidationPlan(
+        ValidationStep(
+            key,
+            model,
+            extractors[key],
+            exclusive_names.get(key),
+            _get_validation_cache(key, model, key in exclusive_names),
+            frozenset() if key in exclusive_names else _nested_model_fields(model),
+        )
+        for key, model in models.items()
+    )
+    if not getattr(settings, "DSA_MERGE_PARAMETER_MODELS", False) or len(models) < 2:
+        return validation_plan
+
+    fields: Dict[str, Any] = {}
+    sources: List[Tuple[str, Extractor, Any]] = []
+    locations: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+    for key in models:
+        if key in exclusive_names:
+            fields[exclusive_names[key]] = (models[key], Field(..., alias=key))
+            sources.append((key, extractors[key], None))
+            locations[key] = (key, ())
+            continue
 
-            if "cookie" in parameters:
-                data.append(parameters["cookie"].parse_obj(request.COOKIES))
+        aliases = []
+        for name, definition in definitions[key].items():
+            if isinstance(definition, tuple):
+                annotation, field_info = definition
+            else:
+                annotation, field_info = None, definition
+            alias = field_info.alias or name
+            composite_field_info = copy(field_info)
+            composite_field_info.alias = composite_alias = f"{key}.{alias}"
+            composite_field_info.alias_priority = 2
+            fields[name] = (
+                composite_field_info
+                if annotation is None
+                else (annotation, composite_field_info)
+            )
+            aliases.append((alias, composite_alias))
+            locations[composite_alias] = (key, (alias,))
+        sources.append((key, extractors[key], tuple(aliases)))
 
-        # try to get body model and parse
-        if request_body:
-            data.append(request_body.parse_obj(request.DATA))
+    return MergedValidationPlan(
+        create_model("merged_model", **fields),  # type: ignore
+        sources,
+        locations,
+        validation_plan,
+        frozenset().union(*(step.nested for step in validation_plan.steps)),
+    )
 
-    except ValidationError as e:
-        raise RequestValidationError(e)
 
-    # Update the verified parameters into the view into the parameters.
-    for _data in data:
-        if _data.__class__.__name__ == "temporary_model":
-            kwargs.update(_data.dict())
-        else:
-            kwargs[exclusive_models[_data.__class__]] = _data
-
-    return kwargs
+def _verify_params(
+    handler: HTTPHandler, request: HttpRequest, may_path_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    validation_plan = getattr(handler, "__validation_plan__", None)
+    if validation_plan is None:
+        return {}
+    return validation_plan(request, may_path_params)
@@ -0,0 +1,195 @@
+from tempfile import SpooledTemporaryFile
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http.request import HttpRequest
+
+from . import _json
+from .exceptions import JSONParseError
+from .timing import timed
+from .utils import merge_query_dict
+
+
+class LimitedStream:
+    """
+    Wrap a file-like object, raise `RequestDataTooBig` once more than
+    `max_size` bytes have been read from it.
+    """
+
+    def __init__(self, stream: Any, max_size: Optional[int]) -> None:
+        self.stream = stream
+        self.max_size = max_size
+        self.read_size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.read_size += len(chunk)
+        if self.max_size is not None and self.read_size > self.max_size:
+            raise RequestDataTooBig(
+                "Request body exceeded DSA_JSON_MAX_SIZE or DATA_UPLOAD_MAX_MEMORY_SIZE."
+            )
+        return chunk
+
+
+def parse_json_stream(
+    stream: Any, *, max_size: Optional[int] = None, max_depth: Optional[int] = None
+) -> Any:
+    """
+    Incrementally decode JSON from a file-like object, without buffering the
+    raw data. Requires `ijson`.
+    """
+    import ijson
+
+    stream = LimitedStream(stream, max_size)
+    try:
+        if max_depth is None:
+            values = list(ijson.items(stream, "", use_float=True))
+            if len(values) != 1:
+                raise ValueError("Expecting a single JSON value")
+            return values[0]
+
+        builder = ijson.ObjectBuilder()
+        depth = 0
+        for event, value in ijson.basic_parse(stream, use_float=True):
+            if event in ("start_map", "start_array"):
+                depth += 1
+                if depth > max_depth:
+                    raise ValueError(f"Exceeded the maximum depth of {max_depth}")
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            builder.event(event, value)
+        if not hasattr(builder, "value"):
+            raise ValueError("Expecting value")
+        return builder.value
+    except ijson.JSONError as error:
+        raise ValueError(str(error)) from error
+
+
+def _content_length(request: HttpRequest) -> Optional[int]:
+    try:
+        return int(request.META["CONTENT_LENGTH"])
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def get_spooled_body(request: HttpRequest) -> Optional[SpooledTemporaryFile]:
+    """
+    Under ASGI, Django receives the whole body into a `SpooledTemporaryFile`
+    before calling the middleware. Return it if the body has not been read.
+    """
+    stream = getattr(request, "_stream", None)
+    if (
+        isinstance(stream, SpooledTemporaryFile)
+        and not hasattr(request, "_body")
+        and not getattr(request, "_read_started", False)
+    ):
+        return stream
+    return None
+
+
+def is_body_on_disk(request: HttpRequest) -> bool:
+    """
+    Whether the body is spooled to disk, reading it would block the event loop.
+    """
+    body_file = get_spooled_body(request)
+    return body_file is not None and getattr(body_file, "_rolled", False)
+
+
+def parse_json(request: HttpRequest) -> Any:
+    """
+    Decode the JSON body of the request. If `DSA_JSON_STREAM_PARSER` is enabled
+    and the body has not been read yet, it is decoded from the request stream.
+    """
+    try:
+        if getattr(settings, "DSA_JSON_STREAM_PARSER", False) and not hasattr(
+            request, "_body"
+        ):
+            max_size = getattr(
+                settings, "DSA_JSON_MAX_SIZE", settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+            )
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+            if max_size is not None and content_length > max_size:
+                raise RequestDataTooBig(
+                    "Request body exceeded DSA_JSON_MAX_SIZE or DATA_UPLOAD_MAX_MEMORY_SIZE."
+                )
+            max_depth = getattr(settings, "DSA_JSON_MAX_DEPTH", None)
+            body_file = get_spooled_body(request)
+            if body_file is None:
+                return parse_json_stream(
+                    request, max_size=max_size, max_depth=max_depth
+                )
+            # Decode the body spooled by the ASGI handler in place and rewind it,
+            # so `request.body` can still be read.
+            try:
+                return parse_json_stream(
+                    body_file, max_size=max_size, max_depth=max_depth
+                )
+            finally:
+                body_file.seek(0)
+        return _json.loads(request.body)
+    except ValueError as ve:
+        raise JSONParseError("Unable to parse JSON data. Error: {0}".format(ve))
+
+
+def get_request_json(request: HttpRequest) -> Any:
+    """
+    Lazily decode `request.JSON`, it is `None` if the request is not JSON.
+    """
+    try:
+        return request._json  # type: ignore
+    except AttributeError:
+        pass
+
+    if request.content_type == "application/json":
+        with timed(request, "parse", _content_length(request)):
+            request._json = parse_json(request)  # type: ignore
+    else:
+        request._json = None  # type: ignore
+    return request._json  # type: ignore
+
+
+def set_request_json(request: HttpRequest, value: Any) -> None:
+    request._json = value  # type: ignore
+
+
+def parse_form(request: HttpRequest) -> Dict[str, Any]:
+    """
+    Parse the form data of the request, including `PUT`, `PATCH` and `DELETE`
+    requests that Django only parses for `POST`.
+    """
+    if request.method not in ("GET", "POST"):
+        # if you want to know why do that,
+        # read https://aber.sh/articles/Django-Parse-non-POST-Request/
+        if hasattr(request, "_post"):
+            del request._post
+            del request._files
+
+        _shadow = request.method
+        request.method = "POST"
+        try:
+            request._load_post_and_files()  # type: ignore
+        finally:
+            request.method = _shadow
+    return dict(**merge_query_dict(request.POST), **merge_query_dict(request.FILES))
+
+
+def get_request_data(request: HttpRequest) -> Any:
+    """
+    `request.DATA` is the JSON data of JSON requests, or the form data.
+    Both are parsed lazily, when `request.DATA` is first read.
+    """
+    try:
+        return request._data  # type: ignore
+    except AttributeError:
+        pass
+
+    if request.content_type == "application/json":
+        return request.JSON  # type: ignore
+    with timed(request, "parse", _content_length(request)):
+        request._data = parse_form(request)  # type: ignore
+    return request._data  # type: ignore
+
+
+def set_request_data(request: HttpRequest, value: Any) -> None:
+    request._data = value  # type: ignore
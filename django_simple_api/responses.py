@@ -0,0 +1,152 @@
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+import django
+from asgiref.sync import sync_to_async
+from django.db.models import Model
+from django.db.models.query import QuerySet, RawQuerySet
+from django.http.response import HttpResponse, HttpResponseBase, StreamingHttpResponse
+from pydantic import BaseModel
+
+from ._json import dumps
+from .serialize import serialize_with_field_names
+from .utils import get_key_case, get_key_converter
+
+__all__ = ["StreamingJSONResponse"]
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    Stream an iterable as a JSON array, for example `queryset.iter_json()`.
+    Only `batch_size` items are encoded and held in memory at the same time.
+
+    Under ASGI, stream an async iterable such as `queryset.aiter_json()`
+    instead, which requires Django 4.2. Django iterates a sync iterable in the
+    event loop before 4.2, where the database can't be queried.
+    """
+
+    def __init__(
+        self,
+        iterable: Union[Iterable[Any], AsyncIterable[Any]],
+        *args: Any,
+        batch_size: int = 100,
+        **kwargs: Any,
+    ) -> None:
+        kwargs.setdefault("content_type", "application/json")
+        if hasattr(iterable, "__aiter__"):
+            if django.VERSION < (4, 2):
+                raise TypeError("Streaming an async iterable requires Django 4.2.")
+            content: Any = self._aencode(
+                iterable.__aiter__(), batch_size  # type: ignore
+            )
+        else:
+            content = self._encode(iter(iterable), batch_size)  # type: ignore
+        super().__init__(content, *args, **kwargs)
+
+    @staticmethod
+    def _encode(iterator: Iterator[Any], batch_size: int) -> Iterator[bytes]:
+        separator = b"["
+        while True:
+            batch = [
+                dumps(item, ensure_ascii=False) for item in islice(iterator, batch_size)
+            ]
+            if not batch:
+                break
+            yield separator + b",".join(batch)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+    @staticmethod
+    async def _aencode(
+        iterator: AsyncIterator[Any], batch_size: int
+    ) -> AsyncIterator[bytes]:
+        separator = b"["
+        batch: List[bytes] = []
+        async for item in iterator:
+            batch.append(dumps(item, ensure_ascii=False))
+            if len(batch) == batch_size:
+                yield separator + b",".join(batch)
+                separator = b","
+                batch = []
+        if batch:
+            yield separator + b",".join(batch)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
+def _convert_keys(value: Any, convert_key: Callable[[str], str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            convert_key(key) if isinstance(key, str) else key: _convert_keys(
+                item, convert_key
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_convert_keys(item, convert_key) for item in value]
+    return value
+
+
+class ResponseSerializer:
+    """
+    Validate the return value of a view against the response model declared
+    by `describe_response(..., serialize=True)`, and encode it to a response.
+    It is created once when the view is decorated.
+    """
+
+    __slots__ = ("status", "model", "is_root")
+
+    def __init__(self, status: int, model: Optional[Type[BaseModel]]) -> None:
+        self.status = status
+        self.model = model
+        # `List[...]` and other types are wrapped in a model with `__root__`.
+        self.is_root = model is not None and "__root__" in model.__fields__
+
+    async def acall(self, value: Any) -> HttpResponseBase:
+        """
+        Like calling it, but models and querysets are encoded in a thread,
+        the database can't be queried in the event loop.
+        """
+        if isinstance(value, (Model, QuerySet, RawQuerySet)):
+            return await sync_to_async(self)(value)
+        return self(value)
+
+    def __call__(self, value: Any) -> HttpResponseBase:
+        if isinstance(value, HttpResponseBase):
+            return value
+
+        key_case = None
+        if isinstance(value, (Model, QuerySet, RawQuerySet)):
+            # The declared model uses the field names, the key case is applied
+            # to the output, as `to_json()` does.
+            value = serialize_with_field_names(value)
+            key_case = get_key_case()
+
+        if self.model is not None:
+            if not isinstance(value, self.model):
+                value = self.model.parse_obj(value)
+            value = value.dict(by_alias=True)
+            if self.is_root:
+                value = value["__root__"]
+        elif isinstance(value, BaseModel):
+            value = value.dict(by_alias=True)
+
+        if key_case is not None:
+            value = _convert_keys(value, get_key_converter(key_case))
+
+        return HttpResponse(
+            dumps(value, ensure_ascii=False),
+            status=self.status,
+            content_type="application/json",
+        )
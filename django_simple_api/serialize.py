@@ -1,9 +1,94 @@
-from typing import List
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
+import django
+from asgiref.sync import sync_to_async
+from django.apps import apps
 from django.db import models
-from django.conf import settings
 
-from django_simple_api.utils import string_convert, do_nothing
+from django_simple_api.utils import get_key_case, get_key_converter
+
+
+@lru_cache(maxsize=1024)
+def _get_serialize_plan(
+    model_class: Type[models.Model], names: Tuple[str, ...], key_case: Optional[str]
+) -> Tuple[Tuple[str, str], ...]:
+    """
+    生成模型的序列化计划：需要序列化的属性名及其对应的输出键名。
+    同一个模型类在使用相同的 only、defer 查询时，实例的属性名相同，可以复用同一个序列化计划。
+    """
+    convert_key = get_key_converter(key_case)
+    buried_fields = getattr(model_class, "buried_fields", ())
+    return tuple(
+        (name, convert_key(name))
+        for name in names
+        # 私有属性与敏感字段不需要序列化
+        if not name.startswith("_") and name not in buried_fields
+    )
+
+
+def _serialize_model(model, serialized: set, key_case: Optional[str]) -> Any:
+    # 当 model 存在一对一或一对多字段，且该字段的值为 None 时，直接返回空{}，否则会报错。
+    if model is None:
+        return {}
+
+    # 当 model 存在一对一字段时，会陷入循环，使用 serialized 存储已序列化的 model，
+    # 在第二次循环到该 model 时直接返回 model.pk，不再循环。
+    if model in serialized:
+        return model.pk
+    else:
+        serialized.add(model)
+
+    convert_key = get_key_converter(key_case)
+    model_dict = model.__dict__
+
+    result = {
+        convert_key(name): _serialize_model(foreign_key, serialized, key_case)
+        for name, foreign_key in model_dict["_state"]
+        .__dict__.get("fields_cache", {})
+        .items()
+    }
+
+    for name, key in _get_serialize_plan(model.__class__, tuple(model_dict), key_case):
+        result[key] = model_dict[name]
+
+    for name, queryset in model_dict.get("_prefetched_objects_cache", {}).items():
+        result[convert_key(name)] = [
+            _serialize_model(model, serialized, key_case) for model in queryset
+        ]
+
+    return result
+
+
+def _serialize_instance(
+    model: models.Model, exclude_keys: List[str], key_case: Optional[str]
+) -> dict:
+    results = _serialize_model(model, set(), key_case)
+
+    # 剔除排斥的字段
+    for key in exclude_keys:
+        del results[key]
+
+    return results
+
+
+def _get_exclude_keys(
+    excludes: Optional[List[str]], key_case: Optional[str]
+) -> List[str]:
+    if not excludes:
+        return []
+    convert_key = get_key_converter(key_case)
+    return [convert_key(field_name) for field_name in excludes]
 
 
 def serialize_model(self: models.Model, excludes: List[str] = None) -> dict:
@@ -14,64 +99,180 @@ def serialize_model(self: models.Model, excludes: List[str] = None) -> dict:
     # See：
     https://aber.sh/articles/A-new-idea-of-serializing-Django-model/
     """
-    excludes = excludes or []
-    serialized = set()
+    key_case = get_key_case()
+    return _serialize_instance(self, _get_exclude_keys(excludes, key_case), key_case)
 
-    if getattr(settings, "DSA_SERIALIZE_TO_CAMELCASE", False):
-        to_camel_case_func = string_convert
-    else:
-        to_camel_case_func = do_nothing
 
-    def _serialize_model(model) -> dict:
+def _can_serialize_by_values(queryset: models.QuerySet) -> bool:
+    """
+    判断 QuerySet 能否直接使用 values() 序列化，跳过模型实例化。
+    只有在结果与实例序列化完全一致时才可以：没有关联查询、没有 only/defer、没有敏感字段，
+    并且模型实例不会在初始化时添加额外的属性。
+    """
+    model = queryset.model
+    return (
+        isinstance(queryset, models.QuerySet)
+        and queryset._result_cache is None
+        and queryset._iterable_class is models.query.ModelIterable
+        and not queryset.query.select_related
+        and not queryset._prefetch_related_lookups
+        and queryset.query.deferred_loading == (frozenset(), True)
+        and not hasattr(model, "buried_fields")
+        and model.__init__ is models.Model.__init__
+        and model.from_db.__func__ is models.Model.from_db.__func__  # type: ignore
+        and not models.signals.post_init.has_listeners(model)
+    )
 
-        # 当 model 存在一对一字段时，会陷入循环，使用闭包的自由变量存储已序列化的 model，
-        # 在第二次循环到该 model 时直接返回 model.pk，不再循环。
-        nonlocal serialized
-        if model in serialized:
-            return model.pk
-        else:
-            serialized.add(model)
 
-        # 当 model 存在一对一或一对多字段，且该字段的值为 None 时，直接返回空{}，否则会报错。
-        if model is None:
-            return {}
+def _serialize_values(
+    rows: Iterable[dict],
+    model_class: Any,
+    exclude_keys: List[str],
+    key_case: Optional[str],
+) -> Iterator[dict]:
+    plan = None
+    for row in rows:
+        if key_case is not None:
+            # values() 返回的每一行的键都相同，只需要生成一次序列化计划
+            if plan is None:
+                plan = _get_serialize_plan(model_class, tuple(row), key_case)
+            row = {key: row[name] for name, key in plan}
 
-        result = {
-            to_camel_case_func(name): _serialize_model(foreign_key)
-            for name, foreign_key in model.__dict__["_state"]
-            .__dict__.get("fields_cache", {})
-            .items()
-        }
+        # 剔除排斥的字段
+        for key in exclude_keys:
+            del row[key]
 
-        buried_fields = getattr(model, "buried_fields", [])
+        yield row
 
-        for name, value in model.__dict__.items():
 
-            # 敏感字段不需要序列化
-            if name in buried_fields:
-                continue
+def serialize_queryset(
+    self: models.QuerySet,
+    excludes: Optional[List[str]] = None,
+    use_values: Optional[bool] = None,
+) -> List[dict]:
+    """
+    序列化 QuerySet。use_values 为 None 时，自动判断能否使用 values() 跳过模型实例化；
+    也可以传入 True 或 False 强制选择。
+    """
+    key_case = get_key_case()
+    return _serialize_queryset(
+        self, _get_exclude_keys(excludes, key_case), key_case, use_values
+    )
 
-            # 私有属性不需要序列化
-            if name.startswith("_"):
-                continue
 
-            result[to_camel_case_func(name)] = value
+def _serialize_queryset(
+    queryset: models.QuerySet,
+    exclude_keys: List[str],
+    key_case: Optional[str],
+    use_values: Optional[bool],
+) -> List[dict]:
+    if use_values is None:
+        use_values = _can_serialize_by_values(queryset)
+    if use_values:
+        return list(
+            _serialize_values(queryset.values(), queryset.model, exclude_keys, key_case)
+        )
+    return [_serialize_instance(model, exclude_keys, key_case) for model in queryset]
 
-        for name, queryset in model.__dict__.get(
-            "_prefetched_objects_cache", {}
-        ).items():
-            result[to_camel_case_func(name)] = [_serialize_model(model) for model in queryset]  # type: ignore
 
-        return result
+def serialize_with_field_names(value: Any) -> Any:
+    """
+    序列化模型或 QuerySet，键名使用字段名，不使用 DSA_SERIALIZE_KEY_CASE 转换，
+    用于按声明的 pydantic 模型校验序列化结果。
+    """
+    if isinstance(value, models.Model):
+        return _serialize_instance(value, [], None)
+    return _serialize_queryset(value, [], None, None)
 
-    results = _serialize_model(self)
 
-    # 剔除排斥的字段
-    for field_name in excludes:
-        del results[to_camel_case_func(field_name)]
+def _iter_prefetched_chunks(
+    queryset: models.QuerySet, chunk_size: int
+) -> Iterator[models.Model]:
+    """
+    Django 4.1 之前，QuerySet.iterator() 会忽略 prefetch_related，改为按 chunk_size 切片，
+    逐批执行普通查询，每一批都会预取关联数据。
+    """
+    if queryset.query.low_mark or queryset.query.high_mark is not None:
+        # 已经切片的 QuerySet 不能再排序，直接执行
+        yield from queryset
+        return
+
+    if not queryset.ordered:
+        # 切片需要稳定的顺序
+        queryset = queryset.order_by("pk")
+    start = 0
+    while True:
+        chunk = list(queryset[start : start + chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        start += chunk_size
+
+
+def iter_serialize_queryset(
+    self: models.QuerySet,
+    excludes: Optional[List[str]] = None,
+    chunk_size: int = 2000,
+    use_values: Optional[bool] = None,
+) -> Iterator[dict]:
+    """
+    逐条序列化 QuerySet，使用 QuerySet.iterator() 分批从数据库读取，不会把整个查询结果载入内存。
+    可以配合 StreamingJSONResponse 流式返回大量数据。
+    """
+    key_case = get_key_case()
+    exclude_keys = _get_exclude_keys(excludes, key_case)
+    if use_values is None:
+        use_values = _can_serialize_by_values(self)
+    if use_values:
+        yield from _serialize_values(
+            self.values().iterator(chunk_size=chunk_size),
+            self.model,
+            exclude_keys,
+            key_case,
+        )
+        return
+
+    if isinstance(self, models.query.RawQuerySet):
+        iterator = self.iterator()
+    elif self._prefetch_related_lookups and django.VERSION < (4, 1):
+        iterator = _iter_prefetched_chunks(self, chunk_size)
+    else:
+        iterator = self.iterator(chunk_size=chunk_size)
+    for model in iterator:
+        yield _serialize_instance(model, exclude_keys, key_case)
 
-    return results
 
+async def aiter_serialize_queryset(
+    self: models.QuerySet,
+    excludes: Optional[List[str]] = None,
+    chunk_size: int = 2000,
+    use_values: Optional[bool] = None,
+) -> AsyncIterator[dict]:
+    """
+    iter_json() 的异步版本，每次在线程中读取并序列化 chunk_size 条数据，不会在事件循环中查询数据库。
+    在 ASGI 下配合 StreamingJSONResponse 使用（需要 Django 4.2）。
+    """
+    iterator = iter_serialize_queryset(self, excludes, chunk_size, use_values)
+    fetch = sync_to_async(lambda: list(islice(iterator, chunk_size)))
+    while True:
+        chunk = await fetch()
+        if not chunk:
+            return
+        for item in chunk:
+            yield item
+
+
+def warm_up_key_converter() -> None:
+    """
+    预先转换所有模型字段名，填充键名转换的缓存。
+    """
+    key_case = get_key_case()
+    if key_case is None:
+        return
 
-def serialize_queryset(self: models.QuerySet, excludes: List[str] = None) -> List[dict]:
-    return [serialize_model(model, excludes) for model in self]
+    convert_key = get_key_converter(key_case)
+    for model_class in apps.get_models():
+        for field in model_class._meta.get_fields():
+            convert_key(field.name)
+            if getattr(field, "attname", None):
+                convert_key(field.attname)
@@ -0,0 +1,120 @@
+import logging
+from time import perf_counter
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.dispatch import Signal
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+
+__all__ = ["StageTiming", "request_timing"]
+
+logger = logging.getLogger("django_simple_api")
+
+# Sent after the response of a request is created, if `DSA_TIMING` is enabled.
+# Arguments: `request`, `response`, `route` and `timings` (a list of `StageTiming`).
+# Connect a receiver to send the timings to your metrics system.
+request_timing = Signal()
+
+
+class StageTiming(NamedTuple):
+    # `parse`, `validate-<location>`, `validate` (merged models) or `render-422`
+    stage: str
+    # seconds
+    duration: float
+    # bytes of the payload, `None` if unknown
+    size: Optional[int]
+
+
+def get_timings(request: HttpRequest) -> Optional[List[StageTiming]]:
+    """
+    The timings of the request, `None` if `DSA_TIMING` is disabled.
+    """
+    if not getattr(settings, "DSA_TIMING", False):
+        return None
+    try:
+        return request._timings  # type: ignore
+    except AttributeError:
+        request._timings = []  # type: ignore
+        return request._timings  # type: ignore
+
+
+class Timer:
+    """
+    Measure the stage in the `with` block, do nothing if timing is disabled.
+    The `size` can be set in the block, once the payload is known.
+    """
+
+    __slots__ = ("timings", "stage", "size", "start")
+
+    def __init__(
+        self, timings: Optional[List[StageTiming]], stage: str, size: Optional[int]
+    ) -> None:
+        self.timings = timings
+        self.stage = stage
+        self.size = size
+
+    def __enter__(self) -> "Timer":
+        if self.timings is not None:
+            self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.timings is not None:
+            self.timings.append(
+                StageTiming(self.stage, perf_counter() - self.start, self.size)
+            )
+
+
+def timed(request: HttpRequest, stage: str, size: Optional[int] = None) -> Timer:
+    return Timer(get_timings(request), stage, size)
+
+
+def report_timings(request: HttpRequest, response: HttpResponseBase) -> None:
+    """
+    Send `request_timing` and add the `Server-Timing` header if `DSA_SERVER_TIMING`
+    is enabled.
+    """
+    timings = getattr(request, "_timings", None)
+    if not timings:
+        return
+
+    resolver_match = getattr(request, "resolver_match", None)
+    request_timing.send(
+        sender=getattr(resolver_match, "func", None),
+        request=request,
+        response=response,
+        route=getattr(resolver_match, "route", None),
+        timings=timings,
+    )
+
+    if getattr(settings, "DSA_SERVER_TIMING", False):
+        metrics = [
+            f"dsa-{timing.stage};dur={timing.duration * 1000:.3f}"
+            + ("" if timing.size is None else f';desc="{timing.size} bytes"')
+            for timing in timings
+        ]
+        if response.has_header("Server-Timing"):
+            metrics.insert(0, response["Server-Timing"])
+        response["Server-Timing"] = ", ".join(metrics)
+
+
+def report_binding_timings(timings: Iterable[Tuple[str, float]]) -> None:
+    """
+    Log the time spent binding the parameters of all urls at startup, and the
+    slowest `DSA_STARTUP_REPORT` urls.
+    """
+    count = getattr(settings, "DSA_STARTUP_REPORT", 0)
+    if not count:
+        return
+
+    timings = sorted(timings, key=lambda timing: timing[1], reverse=True)
+    lines = [
+        f"Bound the parameters of {len(timings)} urls in "
+        f"{sum(duration for _, duration in timings) * 1000:.1f}ms, the slowest:"
+    ]
+    lines.extend(
+        f"  {duration * 1000:8.2f}ms  {url_format}"
+        for url_format, duration in timings[:count]
+    )
+    logger.info("\n".join(lines))
@@ -1,5 +1,4 @@
-from io import BytesIO
-
+from django.conf import settings
 from django.core.files.base import File
 
 __all__ = ["UploadFile", "UploadImage"]
@@ -33,34 +32,38 @@ class UploadImage(UploadFile):
     def validate(cls, v):
         v = super().validate(v)
 
+        max_size = getattr(settings, "DSA_UPLOAD_IMAGE_MAX_SIZE", None)
+        if max_size is not None and v.size is not None and v.size > max_size:
+            raise ValueError(f"The image must be no larger than {max_size} bytes.")
+
         from PIL import Image
 
-        # We need to get a file object for Pillow. We might have a path or we might
-        # have to read the data into memory.
-        if hasattr(v, "temporary_file_path"):
-            file = v.temporary_file_path()
-        else:
-            file = BytesIO(v.read())
+        max_pixels = getattr(
+            settings, "DSA_UPLOAD_IMAGE_MAX_PIXELS", Image.MAX_IMAGE_PIXELS
+        )
+        v.seek(0)
         try:
-            # load() could spot a truncated JPEG, but it loads the entire
-            # image in memory, which is a DoS vector. See #3848 and #18520.
-            image = Image.open(file)
-            # verify() must be called immediately after the constructor.
-            image.verify()
-
-            # Annotating so subclasses can reuse it for their own validation
-            v.image = image
-            # Pillow doesn't detect the MIME type of all formats. In those
-            # cases, content_type will be None.
-            v.content_type = Image.MIME.get(image.format)
+            # Pillow reads only the header to detect the format and the size,
+            # the file is neither copied into memory nor decoded.
+            image = Image.open(v.file)
+        except Image.DecompressionBombError as error:
+            # Pillow refuses images over twice its own `Image.MAX_IMAGE_PIXELS`.
+            raise ValueError(str(error))
         except Exception:
             # Pillow doesn't recognize it as an image.
             raise TypeError(
                 "Upload a valid image. The file you uploaded "
                 "was either not an image or a corrupted image."
             )
-        if hasattr(v, "seek") and callable(v.seek):
-            v.seek(0)
+        if max_pixels is not None and image.width * image.height > max_pixels:
+            raise ValueError(f"The image must be no larger than {max_pixels} pixels.")
+
+        # Annotating so subclasses can reuse it for their own validation
+        v.image = image
+        # Pillow doesn't detect the MIME type of all formats. In those
+        # cases, content_type will be None.
+        v.content_type = Image.MIME.get(image.format)
+        v.seek(0)
         return v
 
     def __repr__(self):
@@ -0,0 +1,76 @@
+import os
+from tempfile import SpooledTemporaryFile
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+__all__ = ["SpooledUploadedFile", "SpooledFileUploadHandler"]
+
+
+class SpooledUploadedFile(UploadedFile):
+    """
+    A file uploaded into a `SpooledTemporaryFile`, it is kept in memory
+    until it is larger than `max_size`, then rolled over to disk.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        content_type: str,
+        size: Optional[int],
+        charset: Optional[str],
+        content_type_extra: Optional[Dict[str, Any]] = None,
+        max_size: int = 0,
+    ) -> None:
+        _, ext = os.path.splitext(name)
+        file = SpooledTemporaryFile(
+            max_size=max_size,
+            suffix=".upload" + ext,
+            dir=settings.FILE_UPLOAD_TEMP_DIR,
+        )
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+
+    @property
+    def rolled_to_disk(self) -> bool:
+        return getattr(self.file, "_rolled", False)
+
+
+class SpooledFileUploadHandler(FileUploadHandler):
+    """
+    Upload handler that streams the uploaded data into spooled temporary files.
+    Use it instead of Django's memory and temporary file handlers:
+
+        FILE_UPLOAD_HANDLERS = ["django_simple_api.uploadhandler.SpooledFileUploadHandler"]
+
+    Files no larger than `DSA_UPLOAD_SPOOL_MAX_SIZE` (default to
+    `FILE_UPLOAD_MAX_MEMORY_SIZE`) are kept in memory.
+    """
+
+    def new_file(self, *args: Any, **kwargs: Any) -> None:
+        super().new_file(*args, **kwargs)
+        self.file = SpooledUploadedFile(
+            self.file_name,
+            self.content_type,
+            0,
+            self.charset,
+            self.content_type_extra,
+            max_size=getattr(
+                settings,
+                "DSA_UPLOAD_SPOOL_MAX_SIZE",
+                settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+            ),
+        )
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size: int) -> SpooledUploadedFile:
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self) -> None:
+        if hasattr(self, "file"):
+            self.file.close()
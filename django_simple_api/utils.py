@@ -1,11 +1,27 @@
 import re
-from functools import update_wrapper
-from typing import Any, Callable, Generator, List, Sequence, Tuple, TypeVar, Union
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache, update_wrapper, wraps
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from django.conf import settings
 from django.http.request import QueryDict
 from django.urls import URLPattern, URLResolver
 from django.urls.conf import RegexPattern, RoutePattern
+from django.utils.module_loading import import_string
 
 T = TypeVar("T", bound=Callable)
 
@@ -47,6 +63,38 @@ def merge_query_dict(query_dict: QueryDict) -> dict:
     return {k: v if len(v) > 1 else v[0] for k, v in query_dict.lists() if len(v) > 0}
 
 
+class LRUCache:
+    """
+    A thread-safe mapping that keeps at most `maxsize` items, the least recently
+    used item is evicted first.
+    """
+
+    __slots__ = ("maxsize", "data", "lock")
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self.lock:
+            try:
+                self.data.move_to_end(key)
+            except KeyError:
+                return None
+            return self.data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
 def is_class_view(handler: Callable) -> bool:
     """
     Judge handler is django.views.View subclass
@@ -91,7 +139,23 @@ def wrapper_include(wrappers: Sequence[Callable[[T], T]], view: Any) -> Any:
     return view
 
 
-def string_convert(string: str):
+def key_converter(func: Callable[[str], str]) -> Callable[[str], str]:
+    """
+    Memoize a key conversion function with a bounded cache and intern the
+    results. The field names of models are few and fixed, so each of them
+    is converted only once.
+    """
+
+    @lru_cache(maxsize=4096)
+    @wraps(func)
+    def wrapper(string: str) -> str:
+        return sys.intern(func(string))
+
+    return wrapper
+
+
+@key_converter
+def string_convert(string: str) -> str:
     """
     将连字符格式转成小驼峰格式
     example: user_name -> userName
@@ -106,6 +170,55 @@ def string_convert(string: str):
     return "".join(char_list)
 
 
+@key_converter
+def string_convert_to_pascal_case(string: str) -> str:
+    """
+    将连字符格式转成大驼峰格式
+    example: user_name -> UserName
+    """
+    return "".join(char.capitalize() for char in string.split("_"))
+
+
+@key_converter
+def string_convert_to_kebab_case(string: str) -> str:
+    """
+    将连字符格式转成短横线格式
+    example: user_name -> user-name
+    """
+    return string.replace("_", "-")
+
+
+KEY_CONVERTERS: Dict[str, Callable[[str], str]] = {
+    "camelCase": string_convert,
+    "PascalCase": string_convert_to_pascal_case,
+    "kebab-case": string_convert_to_kebab_case,
+}
+
+
+def get_key_case() -> Optional[str]:
+    """
+    The key case of serialization: `DSA_SERIALIZE_KEY_CASE`, or `camelCase`
+    if `DSA_SERIALIZE_TO_CAMELCASE` is enabled.
+    """
+    key_case = getattr(settings, "DSA_SERIALIZE_KEY_CASE", None)
+    if key_case is None and getattr(settings, "DSA_SERIALIZE_TO_CAMELCASE", False):
+        return "camelCase"
+    return key_case
+
+
+@lru_cache(maxsize=None)
+def get_key_converter(key_case: Optional[str]) -> Callable[[str], str]:
+    """
+    `key_case` is one of `KEY_CONVERTERS`, or the dotted path of a custom
+    conversion function.
+    """
+    if key_case is None:
+        return do_nothing
+    if key_case in KEY_CONVERTERS:
+        return KEY_CONVERTERS[key_case]
+    return key_converter(import_string(key_case))
+
+
 def do_nothing(x):
     return x
 
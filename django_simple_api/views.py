@@ -1,21 +1,31 @@
+import gzip
+import hashlib
 import operator
+import threading
+import time
 import warnings
 from pathlib import Path
 from copy import deepcopy
-from functools import reduce
-from typing import Any, Dict, Tuple
+from functools import lru_cache, reduce
+from typing import Any, Dict, List, NamedTuple, Tuple
 
-from django.http.response import JsonResponse, HttpResponse
+from django.http.response import HttpResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 
+from .__version__ import __version__
+from ._json import dumps
+from .docs_cache import get_cache_key, load_docs_cache
 from .exceptions import RequestValidationError
 from .extras import merge_openapi_info
+from .params import ensure_bound
 from .schema import schema_parameter, schema_request_body, schema_response
 from .utils import get_all_urls, is_class_view
 
 
 def docs(request, template_name: str = "swagger.html", **kwargs: Any):
-    return render(request, template_name, context={})
+    return render(request, template_name, context={"version": __version__})
 
 
 def _generate_method_docs(function) -> Tuple[Dict[str, Any], Dict[str, Any]]:
@@ -105,6 +115,64 @@ def _generate_path_docs(handler) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     return {k: v for k, v in result.items() if v}, definitions
 
 
+def generate_paths_docs(
+    use_cache: bool = True,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Generate the `paths` and `definitions` of the OpenAPI document from all urls.
+    The documents of the handlers found in `DSA_DOCS_CACHE` are not generated again.
+    """
+    definitions: Dict[str, Any] = {}
+    paths = {}
+    docs_cache = load_docs_cache() if use_cache else None
+    for url_pattern, view in get_all_urls():
+        fragment = docs_cache.get(get_cache_key(view)) if docs_cache else None
+        if fragment is None:
+            ensure_bound(view)
+            fragment = _generate_path_docs(view)
+        paths[url_pattern], _definitions = fragment
+        definitions.update(_definitions)
+    return {k: v for k, v in paths.items() if v}, deepcopy(definitions)
+
+
+class PathsDocs(NamedTuple):
+    # `"paths": {...},"definitions": {...}` serialized as JSON object members.
+    content: bytes
+    digest: bytes
+    last_modified: int
+
+
+@lru_cache(maxsize=None)
+def get_paths_docs() -> PathsDocs:
+    """
+    The `paths` and `definitions` don't change while the process is running,
+    generate and serialize them only once.
+    """
+    paths, definitions = generate_paths_docs()
+    content = (
+        b'"paths":'
+        + dumps(paths, ensure_ascii=False)
+        + b',"definitions":'
+        + dumps(definitions, ensure_ascii=False)
+    )
+    return PathsDocs(content, hashlib.sha256(content).digest(), int(time.time()))
+
+
+def generate_openapi_docs(
+    title: str, description: str, version: str, servers: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Generate the OpenAPI document without `paths` and `definitions`.
+    """
+    openapi_docs: Dict[str, Any] = {
+        "openapi": "3.0.0",
+        "info": {"title": title, "description": description, "version": version},
+    }
+    if servers:
+        openapi_docs["servers"] = servers
+    return openapi_docs
+
+
 def get_docs(
     request,
     title: str = "Django Simple API",
@@ -112,10 +180,11 @@ def get_docs(
     version: str = "0.1.0",
     **kwargs: Any,
 ):
-    openapi_docs = {
-        "openapi": "3.0.0",
-        "info": {"title": title, "description": description, "version": version},
-        "servers": [
+    openapi_docs = generate_openapi_docs(
+        title,
+        description,
+        version,
+        servers=[
             {
                 "url": request.build_absolute_uri("/"),
                 "description": "Current API Server Host",
@@ -135,37 +204,134 @@ def get_docs(
                 },
             },
         ],
-    }
-    definitions = {}
-    paths = {}
-    for url_pattern, view in get_all_urls():
-        paths[url_pattern], _definitions = _generate_path_docs(view)
-        definitions.update(_definitions)
-    openapi_docs["paths"] = {k: v for k, v in paths.items() if v}
-    openapi_docs["definitions"] = deepcopy(definitions)
-    return JsonResponse(openapi_docs, json_dumps_params={"ensure_ascii": False})
+    )
+    paths_docs = get_paths_docs()
+    head = dumps(openapi_docs, ensure_ascii=False)
+    etag = quote_etag(hashlib.sha256(paths_docs.digest + head).hexdigest())
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=paths_docs.last_modified
+    )
+    if response is None:
+        # Only the `servers` changes with the request, splice the cached
+        # `paths` and `definitions` into the serialized JSON object.
+        response = HttpResponse(
+            head[:-1] + b"," + paths_docs.content + b"}",
+            content_type="application/json",
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(paths_docs.last_modified)
+    return response
 
 
-def get_static(request):
-    file_no = request.GET.get("file_no")
+STATIC_FILES = {
+    "1": ("swagger-ui.css", "text/css"),
+    "2": ("swagger-ui-bundle.js", "application/x-javascript"),
+    "3": ("redoc.standalone.js", "application/x-javascript"),
+}
+
+
+class StaticFile(NamedTuple):
+    content_type: str
+    # content-coding -> content, `identity` is the original file.
+    contents: Dict[str, bytes]
+    digest: str
+    last_modified: int
+
+
+_static_files: Dict[str, StaticFile] = {}
+_static_files_lock = threading.Lock()
 
-    static_path = Path(__file__).parent.absolute() / "static"
-    if file_no == "1":
-        file_path = static_path / "swagger-ui.css"
-        content_type = "text/css"
-    elif file_no == "2":
-        file_path = static_path / "swagger-ui-bundle.js"
-        content_type = "application/x-javascript"
-
-    elif file_no == "3":
-        file_path = static_path / "redoc.standalone.js"
-        content_type = "application/x-javascript"
+
+def load_static_file(file_no: str) -> StaticFile:
+    """
+    Read the bundled file and compress it only once, even if the first
+    requests for it arrive at the same time.
+    """
+    static_file = _static_files.get(file_no)
+    if static_file is None:
+        with _static_files_lock:
+            static_file = _static_files.get(file_no)
+            if static_file is None:
+                static_file = _static_files[file_no] = _read_static_file(file_no)
+    return static_file
+
+
+def _read_static_file(file_no: str) -> StaticFile:
+    filename, content_type = STATIC_FILES[file_no]
+    file_path = Path(__file__).parent.absolute() / "static" / filename
+    content = file_path.read_bytes()
+
+    contents = {"identity": content, "gzip": gzip.compress(content)}
+    try:
+        import brotli
+    except ImportError:
+        pass
     else:
+        # The default quality 11 takes seconds for the bundled scripts,
+        # quality 5 is far faster and still compresses better than gzip.
+        contents["br"] = brotli.compress(content, quality=5)
+
+    return StaticFile(
+        content_type,
+        contents,
+        hashlib.sha256(content).hexdigest(),
+        int(file_path.stat().st_mtime),
+    )
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Parse the Accept-Encoding header into the quality value of each coding.
+    """
+    encodings = {}
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.partition(";")
+        try:
+            quality = float(params.strip().partition("q=")[2] or 1)
+        except ValueError:
+            continue
+        encodings[encoding.strip().lower()] = quality
+    return encodings
+
+
+def _is_accepted(encoding: str, accepted_encodings: Dict[str, float]) -> bool:
+    # An explicit quality value takes precedence over `*`.
+    return accepted_encodings.get(encoding, accepted_encodings.get("*", 0)) > 0
+
+
+def get_static(request):
+    file_no = request.GET.get("file_no")
+    if file_no not in STATIC_FILES:
         return HttpResponse()
 
-    with open(file_path, "rb") as file:
-        file = file.read()
+    static_file = load_static_file(file_no)
+    accepted_encodings = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    encoding = next(
+        (
+            encoding
+            for encoding in ("br", "gzip")
+            if encoding in static_file.contents
+            and _is_accepted(encoding, accepted_encodings)
+        ),
+        "identity",
+    )
+    if encoding == "identity":
+        etag = quote_etag(static_file.digest)
+    else:
+        etag = quote_etag(f"{static_file.digest}-{encoding}")
 
-    response = HttpResponse(file)
-    response["Content-Type"] = content_type
+    response = get_conditional_response(
+        request, etag=etag, last_modified=static_file.last_modified
+    )
+    if response is None:
+        response = HttpResponse(static_file.contents[encoding])
+        response["Content-Type"] = static_file.content_type
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(static_file.last_modified)
+    # The url of the file contains the version of Simple API, see `docs`.
+    response["Cache-Control"] = "public, max-age=31536000"
+    patch_vary_headers(response, ("Accept-Encoding",))
     return response
@@ -0,0 +1,36 @@
+import pytest
+from django.test import RequestFactory, override_settings
+
+from django_simple_api.params import parse_and_bound_params
+from django_simple_api.utils import get_all_urls
+from django_simple_api.views import get_docs, get_paths_docs
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def urlconf():
+    # Documents of more than 500 paths.
+    with override_settings(ROOT_URLCONF="tests.benchmarks.urls"):
+        for _, handler in get_all_urls():
+            parse_and_bound_params(handler)
+        get_paths_docs.cache_clear()
+        yield
+    get_paths_docs.cache_clear()
+
+
+def test_generate_docs(benchmark):
+    def generate():
+        get_paths_docs.cache_clear()
+        return get_paths_docs()
+
+    assert benchmark(generate).content
+
+
+@pytest.mark.parametrize("conditional", [False, True], ids=["200", "304"])
+def test_get_docs(benchmark, conditional):
+    request = RequestFactory().get("/docs/get-docs")
+    if conditional:
+        request.META["HTTP_IF_NONE_MATCH"] = get_docs(request)["ETag"]
+    response = benchmark(get_docs, request)
+    assert response.status_code == (304 if conditional else 200)
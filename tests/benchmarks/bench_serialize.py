@@ -0,0 +1,31 @@
+import pytest
+from django.contrib.auth.models import User
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def users(django_db):
+    User.objects.bulk_create(
+        User(username=f"user{i}", email=f"user{i}@example.com") for i in range(1000)
+    )
+    yield User.objects.all()
+    User.objects.all().delete()
+
+
+def test_serialize_model(benchmark, users):
+    user = users.first()
+    assert benchmark(user.to_json)["username"] == user.username
+
+
+@pytest.mark.parametrize("use_values", [False, True], ids=["instances", "values"])
+@pytest.mark.parametrize("size", [10, 1000])
+def test_serialize_queryset(benchmark, users, size, use_values):
+    queryset = users.order_by("id")[:size]
+    result = benchmark(lambda: queryset.all().to_json(use_values=use_values))
+    assert len(result) == size
+
+
+def test_iter_serialize_queryset(benchmark, users):
+    result = benchmark(lambda: list(users.all().iter_json(chunk_size=100)))
+    assert len(result) == 1000
@@ -0,0 +1,112 @@
+from inspect import Parameter, Signature
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.client import BOUNDARY, encode_multipart
+from django.urls import resolve
+from pydantic import create_model
+
+from django_simple_api import Query
+from django_simple_api.exceptions import RequestValidationError
+from django_simple_api.params import parse_and_bound_params, verify_params
+
+pytest.importorskip("pytest_benchmark")
+
+factory = RequestFactory()
+
+
+def make_query_handler(count: int, exclusive: bool):
+    """
+    A handler with `count` int query parameters, declared one by one or
+    as an exclusive model.
+    """
+    names = [f"p{i}" for i in range(count)]
+
+    def handler(request, **kwargs):
+        return HttpResponse()
+
+    if exclusive:
+        model = create_model("Page", **{name: (int, ...) for name in names})
+        parameters = [
+            Parameter(
+                "query",
+                Parameter.KEYWORD_ONLY,
+                default=Query(exclusive=True),
+                annotation=model,
+            )
+        ]
+    else:
+        parameters = [
+            Parameter(name, Parameter.KEYWORD_ONLY, default=Query(), annotation=int)
+            for name in names
+        ]
+    handler.__signature__ = Signature(  # type: ignore
+        [Parameter("request", Parameter.POSITIONAL_OR_KEYWORD), *parameters]
+    )
+    parse_and_bound_params(handler)
+    return handler, {name: str(i) for i, name in enumerate(names)}
+
+
+def run(handler, request, path_params):
+    # Drop the data parsed lazily, so that every round parses the body again.
+    for name in ("_json", "_data", "_post", "_files"):
+        request.__dict__.pop(name, None)
+    try:
+        return verify_params(handler, request, path_params)
+    except RequestValidationError as error:
+        return error
+
+
+@pytest.mark.parametrize("exclusive", [False, True], ids=["fields", "exclusive"])
+@pytest.mark.parametrize("count", [1, 5, 20])
+def test_query(benchmark, count, exclusive):
+    handler, data = make_query_handler(count, exclusive)
+    request = factory.get("/", data)
+    assert benchmark(run, handler, request, {})
+
+
+@pytest.mark.parametrize("exclusive", [False, True], ids=["fields", "exclusive"])
+@pytest.mark.parametrize("count", [1, 5, 20])
+def test_query_error(benchmark, count, exclusive):
+    handler, data = make_query_handler(count, exclusive)
+    request = factory.get("/", {name: "x" for name in data})
+    error = benchmark(run, handler, request, {})
+    assert isinstance(error, RequestValidationError)
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    ["application/json", "application/x-www-form-urlencoded", "multipart/form-data"],
+)
+def test_body(benchmark, content_type):
+    match = resolve("/test/test-put-func/1")
+    if content_type == "multipart/form-data":
+        content_type = f"multipart/form-data; boundary={BOUNDARY}"
+        data = encode_multipart(BOUNDARY, {"name": "3"})
+    elif content_type == "application/json":
+        data = '{"name": "3"}'
+    else:
+        data = "name=3"
+    request = factory.put("/test/test-put-func/1", data, content_type=content_type)
+    # Cache the raw body, so that the stream can be parsed in every round.
+    request.body
+    assert benchmark(run, match.func, request, match.kwargs) == {"id": 1, "name": "3"}
+
+
+@pytest.mark.parametrize(
+    "url, success",
+    [
+        ("/test/just-test/1", True),
+        ("/test/just-test/x", False),
+        ("/test/test-query-page?page-size=20&page-num=2", True),
+        ("/test/test-query-page?page-size=x&page-num=2", False),
+        ("/test/test-query-page-by-exclusive?page-size=20&page-num=2", True),
+        ("/test/test-query-page-by-exclusive?page-size=x&page-num=2", False),
+    ],
+)
+def test_views(benchmark, url, success):
+    request = factory.get(url)
+    match = resolve(request.path_info)
+    result = benchmark(run, match.func, request, match.kwargs)
+    assert isinstance(result, RequestValidationError) is not success
@@ -0,0 +1,27 @@
+"""
+Benchmarks of the hot paths, they are not run by `pytest` or
+`manage.py test` by default.
+
+    pip install pytest-benchmark
+    pytest tests/benchmarks --benchmark-autosave
+    # compare with the last saved run, e.g. before a release
+    pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import django
+import pytest
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+
+django.setup()
+setup_test_environment()
+
+
+@pytest.fixture(scope="session")
+def django_db():
+    old_config = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(old_config, verbosity=0)
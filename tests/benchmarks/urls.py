@@ -0,0 +1,29 @@
+from django.http import HttpResponse
+from django.urls import include, path
+
+from django_simple_api import Body, Path, Query, allow_request_method
+
+
+def make_handler(i: int):
+    @allow_request_method("post")
+    def handler(
+        request,
+        id: int = Path(),
+        page_size: int = Query(10, alias="page-size"),
+        name: str = Body(),
+    ):
+        """
+        This is summary.
+
+        This is description.
+        """
+        return HttpResponse()
+
+    handler.__qualname__ = f"handler_{i}"
+    return handler
+
+
+urlpatterns = [
+    path("docs/", include("django_simple_api.urls")),
+    path("test/", include("tests.urls")),
+] + [path(f"generated-{i}/<id>", make_handler(i)) for i in range(500)]
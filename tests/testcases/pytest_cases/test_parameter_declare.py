@@ -1,12 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 import pytest
 
 from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Extra, Field
 
-from django_simple_api import Query
-from django_simple_api.exceptions import ExclusiveFieldError
-from django_simple_api.params import parse_and_bound_params
+from django_simple_api import Body, Cookie, Header, Path, Query
+from django_simple_api.exceptions import ExclusiveFieldError, RequestValidationError
+from django_simple_api.params import (
+    MergedValidationPlan,
+    is_bound,
+    parse_and_bound_params,
+    verify_params,
+)
 
 
 class QueryPage(BaseModel):
@@ -34,6 +43,25 @@ def just_test_view_4(
     return HttpResponse()
 
 
+def just_test_view_5(
+    request,
+    p1: int = Path(),
+    p2: QueryPage = Query(exclusive=True),
+):
+    return HttpResponse()
+
+
+def just_test_view_6(
+    request,
+    p1: int = Path(),
+    p2: int = Query(alias="page-size"),
+    p3: str = Header(default="", alias="X-Token"),
+    p4=Cookie(default="0"),
+    p5: QueryPage = Body(exclusive=True),
+):
+    return HttpResponse()
+
+
 class TestParameterDeclare:
     def test_parameter_declare_1(self):
         with pytest.raises(
@@ -78,3 +106,237 @@ class TestParameterDeclare:
                 p1: QueryPage = Query(exclusive=True, title="1"),
             ):
                 return HttpResponse()
+
+    def test_validation_plan(self):
+        parse_and_bound_params(just_test_view_5)
+        assert len(just_test_view_5.__validation_plan__.steps) == 2
+
+        request = RequestFactory().get("/", {"page-size": "20"})
+        kwargs = verify_params(just_test_view_5, request, {"p1": "1"})
+        assert kwargs["p1"] == 1
+        assert isinstance(kwargs["p2"], QueryPage)
+        assert (kwargs["p2"].size, kwargs["p2"].num) == (20, 1)
+
+
+def _verify(request, path_params):
+    try:
+        return verify_params(just_test_view_6, request, path_params)
+    except RequestValidationError as e:
+        return e.errors()
+
+
+@pytest.mark.parametrize(
+    "request_,path_params",
+    [
+        (RequestFactory().get("/", {"page-size": "2"}), {"p1": "1"}),
+        (RequestFactory().get("/", {"page-size": "a"}), {"p1": "a"}),
+        (RequestFactory().get("/"), {"p1": "1"}),
+        (RequestFactory().get("/", {"page-size": "a"}, HTTP_X_TOKEN="t"), {}),
+        (
+            RequestFactory().post("/?page-size=3", {"page-size": "b"}),
+            {"p1": "1"},
+        ),
+    ],
+)
+def test_merged_validation_plan(request_, path_params):
+    request_.DATA = dict(request_.POST.items())
+
+    parse_and_bound_params(just_test_view_6)
+    expected = _verify(request_, path_params)
+
+    with override_settings(DSA_MERGE_PARAMETER_MODELS=True):
+        parse_and_bound_params(just_test_view_6)
+    assert isinstance(just_test_view_6.__validation_plan__, MergedValidationPlan)
+    assert _verify(request_, path_params) == expected
+
+    request_.DATA = ["not", "a", "dict"]
+    merged = _verify(request_, path_params)
+    parse_and_bound_params(just_test_view_6)
+    assert merged == _verify(request_, path_params)
+
+
+class Item(BaseModel):
+    name: str
+
+
+def nested_models_view(
+    request,
+    p1: int = Path(),
+    item: Item = Body(),
+    items: List[Item] = Body(),
+    page: QueryPage = Query(exclusive=True),
+):
+    return HttpResponse()
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_nested_models_as_dicts(merge):
+    request_ = RequestFactory().get("/?page-size=2")
+    request_.DATA = {"item": {"name": "a"}, "items": [{"name": "b"}]}
+    with override_settings(DSA_MERGE_PARAMETER_MODELS=merge):
+        parse_and_bound_params(nested_models_view)
+    kwargs = verify_params(nested_models_view, request_, {"p1": "1"})
+    assert kwargs["p1"] == 1
+    # Models compare equal to dicts.
+    assert type(kwargs["item"]) is dict and kwargs["item"] == {"name": "a"}
+    assert type(kwargs["items"][0]) is dict and kwargs["items"] == [{"name": "b"}]
+    # Exclusive models are bound as they are.
+    assert isinstance(kwargs["page"], QueryPage) and kwargs["page"].size == 2
+
+
+class StrictQuery(BaseModel):
+    a: int
+
+    class Config:
+        extra = Extra.forbid
+
+
+def strict_query_view(request, query: StrictQuery = Query(exclusive=True)):
+    return HttpResponse()
+
+
+def test_forbid_extra_keys():
+    parse_and_bound_params(strict_query_view)
+    request_ = RequestFactory().get("/", {"a": "1"})
+    assert verify_params(strict_query_view, request_, {})["query"].a == 1
+
+    request_ = RequestFactory().get("/", {"a": "1", "b": "2"})
+    with pytest.raises(RequestValidationError) as error:
+        verify_params(strict_query_view, request_, {})
+    assert error.value.errors()[0]["type"] == "value_error.extra"
+
+
+def just_test_view_7(request, p1: int = Path(), p2: str = Query("a")):
+    return HttpResponse()
+
+
+def test_bind_on_first_dispatch():
+    assert not hasattr(just_test_view_7, "__validation_plan__")
+
+    request_ = RequestFactory().get("/")
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(
+                lambda _: verify_params(just_test_view_7, request_, {"p1": "1"}),
+                range(8),
+            )
+        )
+    assert results == [{"p1": 1, "p2": "a"}] * 8
+    assert is_bound(just_test_view_7)
+
+
+class MethodViews:
+    def index(self, request):
+        return HttpResponse()
+
+    def detail(self, request, p1: int = Path()):
+        return HttpResponse()
+
+
+def test_bind_bound_methods():
+    views = MethodViews()
+    request_ = RequestFactory().get("/")
+    assert verify_params(views.index, request_, {}) == {}
+    assert verify_params(views.detail, request_, {"p1": "1"}) == {"p1": 1}
+    assert is_bound(views.index) and is_bound(MethodViews().detail)
+
+
+class AllHeaders(BaseModel):
+    class Config:
+        extra = Extra.allow
+
+
+def just_test_view_8(
+    request,
+    token: str = Header(alias="Authorization"),
+    content_type: str = Header(alias="Content-Type"),
+    x_token: str = Header("x"),
+    session_id: str = Cookie(),
+):
+    return HttpResponse()
+
+
+def just_test_view_9(request, headers: AllHeaders = Header(exclusive=True)):
+    return HttpResponse()
+
+
+def test_extract_declared_headers_and_cookies():
+    parse_and_bound_params(just_test_view_8)
+    extract_header, extract_cookie = (
+        step.extract for step in just_test_view_8.__validation_plan__.steps
+    )
+    request_ = RequestFactory().post(
+        "/",
+        {},
+        HTTP_AUTHORIZATION="t",
+        HTTP_X_TOKEN="y",
+        HTTP_X_FORWARDED_FOR="127.0.0.1",
+    )
+    request_.COOKIES = {"session_id": "s", "csrftoken": "c"}
+
+    # The names in `request.headers` never contain "_", so `x_token` never matches.
+    assert extract_header(request_, {}) == {
+        "Authorization": "t",
+        "Content-Type": request_.META["CONTENT_TYPE"],
+    }
+    assert extract_cookie(request_, {}) == {"session_id": "s"}
+    assert verify_params(just_test_view_8, request_, {})["x_token"] == "x"
+
+    # A model that accepts extra keys gets all the headers.
+    parse_and_bound_params(just_test_view_9)
+    headers = verify_params(just_test_view_9, request_, {})["headers"]
+    assert headers.dict()["X-Forwarded-For"] == "127.0.0.1"
+
+
+def just_test_view_10(
+    request, ids: List[int] = Query(alias="id"), page: int = Query(1)
+):
+    return HttpResponse()
+
+
+def test_extract_declared_query():
+    parse_and_bound_params(just_test_view_10)
+    (step,) = just_test_view_10.__validation_plan__.steps
+    request_ = RequestFactory().get("/", {"id": "1", "page": "2", "q": "x"})
+    assert step.extract(request_, {}) == {"id": ["1"], "page": "2"}
+    assert verify_params(just_test_view_10, request_, {}) == {"ids": [1], "page": 2}
+
+    request_ = RequestFactory().get("/?id=1&id=2")
+    assert verify_params(just_test_view_10, request_, {}) == {"ids": [1, 2], "page": 1}
+
+    with pytest.raises(RequestValidationError):
+        verify_params(
+            just_test_view_10, RequestFactory().get("/?id=1&page=1&page=2"), {}
+        )
+
+
+class FrozenPage(BaseModel):
+    size: int = Field(10, alias="page-size")
+
+    class Config:
+        frozen = True
+
+
+def just_test_view_11(request, page: FrozenPage = Query(exclusive=True)):
+    return HttpResponse()
+
+
+def just_test_view_12(request, page: QueryPage = Query(exclusive=True)):
+    return HttpResponse()
+
+
+@override_settings(DSA_VALIDATION_CACHE_SIZE=2)
+def test_validation_cache():
+    parse_and_bound_params(just_test_view_11)
+    parse_and_bound_params(just_test_view_12)
+    (step,) = just_test_view_11.__validation_plan__.steps
+    assert just_test_view_12.__validation_plan__.steps[0].cache is None
+
+    first = verify_params(just_test_view_11, RequestFactory().get("/?page-size=2"), {})
+    again = verify_params(just_test_view_11, RequestFactory().get("/?page-size=2"), {})
+    assert first["page"] is again["page"]
+    assert first["page"].size == 2
+
+    with pytest.raises(RequestValidationError):
+        verify_params(just_test_view_11, RequestFactory().get("/?page-size=a"), {})
+    assert len(step.cache) == 1
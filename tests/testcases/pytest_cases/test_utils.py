@@ -2,7 +2,13 @@ import pytest
 from django.http.request import QueryDict
 from django.urls import path, re_path
 
-from django_simple_api.utils import _reformat_pattern, merge_query_dict
+from django_simple_api.utils import (
+    LRUCache,
+    _reformat_pattern,
+    get_key_converter,
+    merge_query_dict,
+    string_convert,
+)
 
 
 @pytest.mark.parametrize("query_dict,result", [(QueryDict(mutable=True), {})])
@@ -21,3 +27,31 @@ def test_merge_query_dict(query_dict, result):
 )
 def test_reformat_pattern(pattern, path_format):
     assert _reformat_pattern(pattern) == path_format
+
+
+@pytest.mark.parametrize(
+    "key_case,string,result",
+    [
+        (None, "user_name", "user_name"),
+        ("camelCase", "user_name", "userName"),
+        ("PascalCase", "user_name", "UserName"),
+        ("kebab-case", "user_name", "user-name"),
+        ("string.capwords", "user_name", "User_name"),
+    ],
+)
+def test_get_key_converter(key_case, string, result):
+    assert get_key_converter(key_case)(string) == result
+
+
+def test_string_convert_cache():
+    assert string_convert("first_name") is string_convert("first_name")
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c"), len(cache)) == (1, 3, 2)
@@ -1,5 +1,16 @@
-from django.test import TestCase
-from django.contrib.auth.models import User
+import json
+from unittest import skipIf
+
+import django
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.core.signals import request_finished, request_started
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import Group, User
+
+from django_simple_api import StreamingJSONResponse
+from django_simple_api.serialize import _can_serialize_by_values
 
 
 class TestSerialize(TestCase):
@@ -15,3 +26,104 @@ class TestSerialize(TestCase):
         users = User.objects.filter(username="Zhang")
         assert isinstance(users.to_json(), list)
         assert isinstance(users.to_json()[0], dict)
+
+    def test_serialize_only(self):
+        users = User.objects.only("username")
+        self.assertEqual(users.to_json(), [{"id": users[0].id, "username": "Zhang"}])
+
+        user = User.objects.get(username="Zhang")
+        self.assertIn("password", user.to_json())
+        self.assertNotIn("_state", user.to_json())
+
+    @override_settings(DSA_SERIALIZE_TO_CAMELCASE=True)
+    def test_serialize_to_camelcase(self):
+        user = User.objects.get(username="Zhang")
+        result = user.to_json(excludes=["last_login"])
+        self.assertIn("dateJoined", result)
+        self.assertNotIn("date_joined", result)
+        self.assertNotIn("lastLogin", result)
+        self.assertEqual(User.objects.all().to_json(excludes=["last_login"]), [result])
+
+    def test_iter_serialize_queryset(self):
+        User.objects.create_user(username="Li", email="222@163.com")
+        users = User.objects.order_by("id")
+        self.assertEqual(list(users.iter_json(chunk_size=1)), users.to_json())
+
+        resp = StreamingJSONResponse(users.only("username").iter_json(), batch_size=1)
+        content = json.loads(b"".join(resp.streaming_content))
+        self.assertEqual([user["username"] for user in content], ["Zhang", "Li"])
+
+        resp = StreamingJSONResponse(User.objects.none().iter_json())
+        self.assertEqual(b"".join(resp.streaming_content), b"[]")
+
+    @skipIf(django.VERSION < (4, 2), "Django < 4.2 can't stream async iterators")
+    def test_aiter_serialize_queryset_under_asgi(self):
+        User.objects.create_user(username="Li", email="222@163.com")
+        expected = User.objects.order_by("id").to_json(excludes=["password"])
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/test/test-stream-users",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+        }
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            async_to_sync(ASGIHandler())(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        self.assertEqual(messages[0]["status"], 200)
+        content = b"".join(
+            message.get("body", b"")
+            for message in messages
+            if message["type"] == "http.response.body"
+        )
+        content = json.loads(content)
+        self.assertEqual([user["id"] for user in content], [u["id"] for u in expected])
+        self.assertEqual([user["username"] for user in content], ["Zhang", "Li"])
+        self.assertNotIn("password", content[0])
+
+    @skipIf(django.VERSION >= (4, 2), "Django >= 4.2 streams async iterators")
+    def test_aiter_serialize_queryset_requires_django_42(self):
+        with self.assertRaises(TypeError):
+            StreamingJSONResponse(User.objects.all().aiter_json())
+
+    def test_iter_serialize_prefetched_queryset(self):
+        group = Group.objects.create(name="Admin")
+        User.objects.create_user(username="Li").groups.add(group)
+        User.objects.create_user(username="Wang")
+        users = User.objects.prefetch_related("groups")
+        expected = users.order_by("pk").to_json()
+        self.assertEqual(expected[1]["groups"][0]["name"], "Admin")
+        for chunk_size in (1, 2, 3, 2000):
+            self.assertEqual(list(users.iter_json(chunk_size=chunk_size)), expected)
+        self.assertEqual(
+            list(users.order_by("pk")[1:3].iter_json(chunk_size=1)), expected[1:3]
+        )
+
+    @override_settings(DSA_SERIALIZE_TO_CAMELCASE=True)
+    def test_serialize_queryset_by_values(self):
+        users = User.objects.all()
+        self.assertTrue(_can_serialize_by_values(users))
+        self.assertFalse(_can_serialize_by_values(users.only("username")))
+        self.assertFalse(_can_serialize_by_values(users.prefetch_related("groups")))
+
+        self.assertEqual(
+            users.to_json(excludes=["password"]),
+            users.to_json(excludes=["password"], use_values=False),
+        )
+        self.assertEqual(
+            list(users.iter_json(excludes=["password"])),
+            users.to_json(excludes=["password"], use_values=False),
+        )
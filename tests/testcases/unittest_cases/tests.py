@@ -1,6 +1,51 @@
+import asyncio
+import gzip
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
 from pathlib import Path
-
-from django.test import TestCase
+from typing import List, Optional
+from unittest import skipIf
+from unittest.mock import patch
+
+import django
+import django_simple_api
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from django.views import View
+from PIL import Image
+from pydantic import create_model
+
+from django_simple_api import Body, Query, _json, cache_response, describe_response
+from django_simple_api.middleware import (
+    ParseRequestDataMiddleware,
+    ValidateRequestDataMiddleware,
+)
+from django_simple_api.docs_cache import get_cache_key, load_docs_cache
+from django_simple_api.parsers import is_body_on_disk
+from django_simple_api.timing import report_binding_timings, request_timing
+from django_simple_api.views import generate_paths_docs
+from tests import views
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 
 class TestJustTest(TestCase):
@@ -46,7 +91,7 @@ class TestFunctionView(TestCase):
         self.assertEqual(resp.status_code, 405)
 
     def test_success_post(self):
-        resp = self.client.post("/test/test-post-func/1", HTTP_Authorization="2")
+        resp = self.client.post("/test/test-post-func/1", HTTP_AUTHORIZATION="2")
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.content, b"12")
 
@@ -54,7 +99,7 @@ class TestFunctionView(TestCase):
         resp = self.client.post("/test/test-post-func/1")
         self.assertEqual(resp.status_code, 422)
 
-        resp = self.client.get("/test/test-post-func/1", HTTP_Authorization="2")
+        resp = self.client.get("/test/test-post-func/1", HTTP_AUTHORIZATION="2")
         self.assertEqual(resp.status_code, 405)
 
     def test_success_put(self):
@@ -88,6 +133,607 @@ class TestFunctionView(TestCase):
         self.assertEqual(resp.status_code, 422)
 
 
+class TestAsync(TestCase):
+    def test_async_process_view(self):
+        async def get_response(request):
+            pass
+
+        middleware = ValidateRequestDataMiddleware(get_response)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware.process_view))
+
+        middleware = ValidateRequestDataMiddleware(lambda request: None)
+        self.assertFalse(asyncio.iscoroutinefunction(middleware.process_view))
+
+    async def test_async_views(self):
+        resp = await self.async_client.get("/test/test-async-get-func/1?name_id=2")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"12")
+
+        resp = await self.async_client.get("/test/test-async-get-func/1")
+        self.assertEqual(resp.status_code, 422)
+
+    @skipIf(django.VERSION < (4, 1), "Async class views require Django 4.1")
+    async def test_async_class_views(self):
+        resp = await self.async_client.get("/test/test-async-view/1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"1")
+
+        resp = await self.async_client.get("/test/test-async-view/a")
+        self.assertEqual(resp.status_code, 422)
+
+    async def test_sync_views_in_async_mode(self):
+        # The validator queries the database, which is not allowed in the event loop.
+        resp = await self.async_client.get("/test/test-existing-user?username=Zhang")
+        self.assertEqual(resp.status_code, 422)
+
+        await sync_to_async(User.objects.create)(username="Zhang")
+        resp = await self.async_client.get("/test/test-existing-user?username=Zhang")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"Zhang")
+
+    def test_async_views_in_sync_mode(self):
+        resp = self.client.get("/test/test-async-get-func/1", {"name_id": "2"})
+        self.assertEqual(resp.content, b"12")
+
+        resp = self.client.get("/test/test-async-view/a")
+        self.assertEqual(resp.status_code, 422)
+
+
+class TestParseJSON(TestCase):
+    def test_lazy_json(self):
+        resp = self.client.put(
+            "/test/test-put-func/1", data="{", content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 400)
+
+        # The view does not read `request.DATA`, so the JSON is never decoded.
+        resp = self.client.generic(
+            "GET", "/test/test-common-func-view?id=1", "{", "application/json"
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"1")
+
+    @skipIf(ijson is None, "ijson is not installed")
+    @override_settings(DSA_JSON_STREAM_PARSER=True, DSA_JSON_MAX_DEPTH=1)
+    def test_stream_json(self):
+        resp = self.client.put(
+            "/test/test-put-func/2", data={"name": "3"}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"23")
+
+        resp = self.client.put(
+            "/test/test-put-func/2",
+            data={"name": {"a": "3"}},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    @override_settings(DSA_JSON_STREAM_PARSER=True, DSA_JSON_MAX_SIZE=8)
+    def test_stream_json_too_big(self):
+        resp = self.client.put(
+            "/test/test-put-func/2",
+            data={"name": "3" * 8},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    @skipIf(ijson is None, "ijson is not installed")
+    @override_settings(DSA_JSON_STREAM_PARSER=True)
+    def test_stream_spooled_json(self):
+        body = b'{"name": "3"}'
+        body_file = tempfile.SpooledTemporaryFile(max_size=4)
+        body_file.write(body)
+        body_file.seek(0)
+        request = RequestFactory().generic(
+            "PUT", "/", body, content_type="application/json"
+        )
+        # Like `ASGIRequest`, which reads the body spooled by `ASGIHandler`.
+        request._stream = body_file
+
+        self.assertTrue(is_body_on_disk(request))
+        self.assertEqual(request.JSON, {"name": "3"})
+        # The spooled body is rewound after being decoded in place.
+        self.assertEqual(request.body, body)
+
+
+class TestParseRequestData(TestCase):
+    def test_skip_views_without_body(self):
+        middleware = ParseRequestDataMiddleware(lambda request: None)
+
+        request = RequestFactory().put(
+            "/", "name=3", content_type="application/x-www-form-urlencoded"
+        )
+        self.assertIsNone(
+            middleware.process_view(request, views.test_common_func_view, [], {})
+        )
+        self.assertFalse(hasattr(request, "_data"))
+        self.assertEqual(request.DATA, {"name": "3"})
+
+        request = RequestFactory().put(
+            "/", "name=3", content_type="application/x-www-form-urlencoded"
+        )
+        self.assertIsNone(middleware.process_view(request, views.put_func, [], {}))
+        self.assertEqual(request._data, {"name": "3"})
+
+        request = RequestFactory().put("/", "{", content_type="application/json")
+        resp = middleware.process_view(request, views.put_func, [], {})
+        self.assertEqual(resp.status_code, 400)
+
+
+class TestTiming(TestCase):
+    @override_settings(DSA_TIMING=True, DSA_SERVER_TIMING=True)
+    def test_timing(self):
+        received = []
+
+        def receiver(sender, request, response, route, timings, **kwargs):
+            received.append((route, [timing.stage for timing in timings]))
+
+        request_timing.connect(receiver)
+        try:
+            resp = self.client.put(
+                "/test/test-put-func/2",
+                data={"name": "3"},
+                content_type="application/json",
+            )
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn("dsa-parse;dur=", resp["Server-Timing"])
+            self.assertIn('desc="13 bytes"', resp["Server-Timing"])
+
+            resp = self.client.get("/test/just-test/abc")
+            self.assertEqual(resp.status_code, 422)
+            self.assertIn("dsa-render-422;dur=", resp["Server-Timing"])
+        finally:
+            request_timing.disconnect(receiver)
+
+        self.assertEqual(
+            received,
+            [
+                (
+                    "test/test-put-func/<id>",
+                    ["validate-path", "parse", "validate-body"],
+                ),
+                ("test/just-test/<id>", ["validate-path", "render-422"]),
+            ],
+        )
+
+    @override_settings(DSA_TIMING=True)
+    async def test_timing_receiver_in_async_view(self):
+        received = []
+
+        def receiver(sender, request, response, route, timings, **kwargs):
+            # Blocking receivers, such as database queries, are allowed.
+            received.append(User.objects.count())
+
+        request_timing.connect(receiver)
+        try:
+            resp = await self.async_client.get("/test/test-async-get-func/1?name_id=2")
+        finally:
+            request_timing.disconnect(receiver)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(received, [0])
+
+    def test_timing_disabled(self):
+        resp = self.client.get("/test/just-test/abc")
+        self.assertFalse(resp.has_header("Server-Timing"))
+
+
+class TestStartupReport(TestCase):
+    @override_settings(DSA_STARTUP_REPORT=1)
+    def test_report_binding_timings(self):
+        with self.assertLogs("django_simple_api", "INFO") as logs:
+            report_binding_timings([("/a", 0.001), ("/b", 0.002)])
+        self.assertIn("Bound the parameters of 2 urls in 3.0ms", logs.output[0])
+        self.assertIn("/b", logs.output[0])
+        self.assertNotIn("/a", logs.output[0])
+
+
+class TestSerializeResponse(TestCase):
+    def test_serialize_queryset(self):
+        user = User.objects.create_user(username="Zhang")
+        resp = self.client.get("/test/test-serialize-users", {"username": "Zhang"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(resp.content), [{"id": user.id, "username": "Zhang"}]
+        )
+
+    @override_settings(DSA_SERIALIZE_TO_CAMELCASE=True)
+    def test_serialize_queryset_to_camelcase(self):
+        user = User.objects.create_user(username="Zhang", is_staff=True)
+        resp = self.client.get("/test/test-serialize-staff")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            json.loads(resp.content),
+            [{"id": user.id, "username": "Zhang", "isStaff": True}],
+        )
+
+    async def test_serialize_async_view(self):
+        resp = await self.async_client.get("/test/test-async-serialize-user/1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.content), {"id": 1, "username": "Zhang"})
+
+    async def test_serialize_queryset_in_async_view(self):
+        user = await sync_to_async(User.objects.create)(username="Zhang")
+        resp = await self.async_client.get(
+            "/test/test-async-serialize-users?username=Zhang"
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            json.loads(resp.content), [{"id": user.id, "username": "Zhang"}]
+        )
+
+    def test_serialize_class_view(self):
+        resp = self.client.post("/test/test-serialize-view", {"id": 2})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(json.loads(resp.content), {"id": 2, "username": "Zhang"})
+
+        resp = self.client.post("/test/test-serialize-view", {"id": -1})
+        self.assertEqual(resp.status_code, 404)
+
+        paths, _ = generate_paths_docs()
+        self.assertIn(201, paths["/test/test-serialize-view"]["post"]["responses"])
+
+
+class TestCacheResponse(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_cache_func(self):
+        resp = self.client.get("/test/test-cached-func?a=1&b=2")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("Accept-Language", resp["Vary"])
+
+        again = self.client.get("/test/test-cached-func?b=2&a=01")
+        self.assertEqual(again.content, resp.content)
+        self.assertEqual(again["ETag"], resp["ETag"])
+
+        resp = self.client.get(
+            "/test/test-cached-func?a=1&b=2", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get(
+            "/test/test-cached-func?a=1&b=2", HTTP_ACCEPT_LANGUAGE="zh"
+        )
+        self.assertNotEqual(resp.content, again.content)
+
+    def test_cache_class_view(self):
+        resp = self.client.get("/test/test-cached-view/1")
+        self.assertEqual(
+            resp.content, self.client.get("/test/test-cached-view/1").content
+        )
+        self.assertNotEqual(
+            resp.content, self.client.get("/test/test-cached-view/2").content
+        )
+
+        resp = self.client.post("/test/test-cached-view/1")
+        self.assertNotEqual(
+            resp.content, self.client.post("/test/test-cached-view/1").content
+        )
+
+    def test_cache_inherited_method(self):
+        resp = self.client.get("/test/test-inherited-cached-view/1")
+        self.assertEqual(
+            resp.content, self.client.get("/test/test-inherited-cached-view/1").content
+        )
+        # The base class is not cached.
+        self.assertFalse(hasattr(views.CountView.get, "__wrapped__"))
+
+        with self.assertRaises(TypeError):
+            cache_response(60)(type("PostView", (View,), {"post": views.CountView.get}))
+
+    async def test_cache_async_func(self):
+        resp = await self.async_client.get("/test/test-async-cached-func?page-size=2")
+        again = await self.async_client.get(
+            "/test/test-async-cached-func?page-num=1&page-size=2"
+        )
+        self.assertEqual(resp.content, again.content)
+
+    def test_cache_template_response(self):
+        resp = self.client.get("/test/test-cached-template?a=1")
+        self.assertEqual(resp.status_code, 200)
+        again = self.client.get("/test/test-cached-template?a=1")
+        self.assertEqual(again.content, resp.content)
+        self.assertEqual(again["ETag"], resp["ETag"])
+
+        resp = self.client.get(
+            "/test/test-cached-template?a=1", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+
+    def test_cache_below_serialize(self):
+        # The return value is not a response, so it is serialized but not cached.
+        resp = self.client.get("/test/test-serialize-cached-user/1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["id"], 1)
+        self.assertNotEqual(
+            resp.content, self.client.get("/test/test-serialize-cached-user/1").content
+        )
+
+    def test_cache_docs(self):
+        paths, _ = generate_paths_docs()
+        operation = paths["/test/test-cached-func"]["get"]
+        self.assertIn(304, operation["responses"])
+        self.assertIn(
+            "If-None-Match",
+            [parameter["name"] for parameter in operation["parameters"]],
+        )
+
+
+class TestConditionalResponse(TestCase):
+    def setUp(self):
+        views.rendered.clear()
+
+    def test_hash_body(self):
+        resp = self.client.get("/test/test-conditional-func?a=1")
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+        self.assertEqual(
+            self.client.get("/test/test-conditional-func?a=01")["ETag"], etag
+        )
+
+        resp = self.client.get(
+            "/test/test-conditional-func?a=1", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+        resp = self.client.get(
+            "/test/test-conditional-func?a=2", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_version(self):
+        resp = self.client.get("/test/test-versioned-user/1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"id": 1, "username": "Zhang"})
+
+        resp = self.client.get(
+            "/test/test-versioned-user/1", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+        self.assertTrue(resp.has_header("ETag"))
+        self.assertEqual(views.rendered, [1])
+
+        resp = self.client.get(
+            "/test/test-versioned-user/2", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(views.rendered, [1, 2])
+
+    def test_async_version(self):
+        resp = self.client.get("/test/test-async-versioned-user/1")
+        resp = self.client.get(
+            "/test/test-async-versioned-user/1", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(views.rendered, [1])
+
+        resp = self.client.get("/test/test-async-versioned-user/0")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(views.rendered, [1, 0])
+        resp = self.client.get(
+            "/test/test-async-versioned-user/0", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+
+    def test_sync_version_of_async_view(self):
+        # `users_version` queries the database, which is not allowed in the event loop.
+        resp = self.client.get("/test/test-async-versioned-users?username=Zhang")
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.get(
+            "/test/test-async-versioned-users?username=Zhang",
+            HTTP_IF_NONE_MATCH=resp["ETag"],
+        )
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(views.rendered, [0])
+
+    def test_template_response(self):
+        resp = self.client.get("/test/test-conditional-template?a=1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"1")
+
+        resp = self.client.get(
+            "/test/test-conditional-template?a=1", HTTP_IF_NONE_MATCH=resp["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+
+    def test_inherited_method(self):
+        resp = self.client.get("/test/test-conditional-view/1")
+        self.assertTrue(resp.has_header("ETag"))
+
+    def test_conditional_docs(self):
+        paths, _ = generate_paths_docs()
+        operation = paths["/test/test-versioned-user/{id}"]["get"]
+        self.assertIn(304, operation["responses"])
+        self.assertIn(200, operation["responses"])
+
+
+class TestJSONBackend(TestCase):
+    def test_encode_django_types(self):
+        data = {"name": gettext_lazy("Zhang"), "price": Decimal("1.50")}
+        for backend in ("json", "orjson"):
+            with override_settings(DSA_JSON_BACKEND=backend):
+                self.assertEqual(
+                    json.loads(_json.dumps(data)), {"name": "Zhang", "price": "1.50"}
+                )
+
+    def test_docs_with_lazy_translations(self):
+        resp = self.client.get("/docs/get-docs/")
+        self.assertEqual(resp.status_code, 200)
+        operation = json.loads(resp.content)["paths"][
+            "/test/test-translated-docs-func"
+        ]["get"]
+        self.assertIn("Translated", operation["tags"])
+        self.assertEqual(
+            operation["parameters"][0]["description"], "The ID of the user."
+        )
+
+    @override_settings(DSA_JSON_BACKEND="orjson", DSA_VALIDATION_ERROR_INDENT=None)
+    def test_orjson(self):
+        resp = self.client.put(
+            "/test/test-put-func/2", data={"name": "3"}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"23")
+
+        resp = self.client.get("/test/just-test/abc")
+        self.assertEqual(resp.status_code, 422)
+        self.assertNotIn(b"\n", resp.content)
+        self.assertEqual(json.loads(resp.content)[0]["loc"], ["id"])
+
+        resp = self.client.get("/docs/get-docs/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("/test/just-test/{id}", json.loads(resp.content)["paths"])
+
+
+class TestDocs(TestCase):
+    def test_get_docs(self):
+        resp = self.client.get("/docs/get-docs/")
+        self.assertEqual(resp.status_code, 200)
+        docs = json.loads(resp.content)
+        self.assertEqual(docs["servers"][0]["url"], "http://testserver/")
+        self.assertIn("/test/just-test/{id}", docs["paths"])
+
+        resp = self.client.get("/docs/get-docs/", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
+        # The document contains the server url, so the ETag changes with it.
+        resp = self.client.get(
+            "/docs/get-docs/", HTTP_IF_NONE_MATCH=resp["ETag"], secure=True
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_get_static(self):
+        static_path = (
+            Path(django_simple_api.__file__).parent / "static/swagger-ui-bundle.js"
+        )
+        resp = self.client.get(
+            "/docs/get-static/", {"file_no": "2"}, HTTP_ACCEPT_ENCODING="gzip, br;q=0"
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(resp.content), static_path.read_bytes())
+
+        resp = self.client.get(
+            "/docs/get-static/",
+            {"file_no": "2"},
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=resp["ETag"],
+        )
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get("/docs/get-static/", {"file_no": "2"})
+        self.assertFalse(resp.has_header("Content-Encoding"))
+        self.assertEqual(resp.content, static_path.read_bytes())
+
+        # An explicit q=0 takes precedence over `*`.
+        resp = self.client.get(
+            "/docs/get-static/", {"file_no": "2"}, HTTP_ACCEPT_ENCODING="br;q=0, *"
+        )
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+
+        resp = self.client.get(
+            "/docs/get-static/",
+            {"file_no": "2"},
+            HTTP_ACCEPT_ENCODING="*, br;q=0, gzip;q=0",
+        )
+        self.assertFalse(resp.has_header("Content-Encoding"))
+
+    @skipIf(brotli is None, "brotli is not installed")
+    def test_get_static_brotli(self):
+        static_path = (
+            Path(django_simple_api.__file__).parent / "static/swagger-ui-bundle.js"
+        )
+        resp = self.client.get(
+            "/docs/get-static/", {"file_no": "2"}, HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        self.assertEqual(resp["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(resp.content), static_path.read_bytes())
+
+
+class TestExportOpenAPI(TestCase):
+    def test_export_json(self):
+        stdout = StringIO()
+        call_command(
+            "export_openapi", "--server", "https://example.com/", stdout=stdout
+        )
+        docs = json.loads(stdout.getvalue())
+        self.assertEqual(docs["servers"], [{"url": "https://example.com/"}])
+        self.assertIn("/test/just-test/{id}", docs["paths"])
+
+        stdout_again = StringIO()
+        call_command(
+            "export_openapi", "--server", "https://example.com/", stdout=stdout_again
+        )
+        self.assertEqual(stdout.getvalue(), stdout_again.getvalue())
+
+    @skipIf(yaml is None, "PyYAML is not installed")
+    def test_export_yaml(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "openapi.yaml"
+            call_command("export_openapi", "--output", str(output))
+            docs = yaml.safe_load(output.read_text(encoding="utf8"))
+        self.assertNotIn("servers", docs)
+        self.assertIn("/test/just-test/{id}", docs["paths"])
+
+
+class TestDocsCache(TestCase):
+    def test_cache_openapi(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = str(Path(directory) / "openapi-cache.json")
+            with override_settings(DSA_DOCS_CACHE=cache_path):
+                call_command("cache_openapi", stdout=StringIO())
+                load_docs_cache.cache_clear()
+                try:
+                    fragments = load_docs_cache()
+                    self.assertEqual(
+                        json.dumps(generate_paths_docs(), sort_keys=True, default=str),
+                        json.dumps(
+                            generate_paths_docs(use_cache=False),
+                            sort_keys=True,
+                            default=str,
+                        ),
+                    )
+
+                    # The cached fragment is used instead of generating it.
+                    key = get_cache_key(views.get_func)
+                    fragments[key][0]["get"]["summary"] = "Cached"
+                    paths, _ = generate_paths_docs()
+                    self.assertEqual(
+                        paths["/test/test-get-func/{name}"]["get"]["summary"], "Cached"
+                    )
+                finally:
+                    load_docs_cache.cache_clear()
+
+    def test_cache_key(self):
+        key = get_cache_key(views.JustTest.as_view())
+        self.assertEqual(key, get_cache_key(views.JustTest.as_view()))
+        self.assertNotEqual(key, get_cache_key(views.get_func))
+
+    def test_cache_key_of_nested_models(self):
+        def make_handler(**item_fields):
+            item = create_model("Item", **item_fields)
+            page = create_model("Page", items=(List[item], ...))
+
+            @describe_response(200, content=List[item])
+            def handler(
+                request,
+                page: page = Body(exclusive=True),
+                item: Optional[item] = Query(None),
+            ):
+                pass
+
+            return handler
+
+        key = get_cache_key(make_handler(name=(str, ...)))
+        self.assertEqual(key, get_cache_key(make_handler(name=(str, ...))))
+        self.assertNotEqual(
+            key, get_cache_key(make_handler(name=(str, ...), price=(int, 0)))
+        )
+
+
 class TestExclusive(TestCase):
     def test_success_get(self):
         resp = self.client.get("/test/test-query-page", data={"page-size": 20})
@@ -169,3 +815,56 @@ class TestUpload(TestCase):
                 "/test/test-upload-image-view", data={"image": image}
             )
             self.assertEqual(resp.status_code, 200)
+
+    @override_settings(
+        FILE_UPLOAD_HANDLERS=[
+            "django_simple_api.uploadhandler.SpooledFileUploadHandler"
+        ],
+        DSA_UPLOAD_SPOOL_MAX_SIZE=1024,
+    )
+    def test_upload_image_spooled(self):
+        image_path = Path(__file__).resolve(strict=True).parent.parent / "Python39.png"
+
+        with open(image_path, "rb") as image:
+            resp = self.client.post(
+                "/test/test-upload-image-view", data={"image": image}
+            )
+            self.assertEqual(resp.status_code, 200)
+
+    def test_upload_image_limits(self):
+        image_path = Path(__file__).resolve(strict=True).parent.parent / "Python39.png"
+
+        for limit in (
+            {"DSA_UPLOAD_IMAGE_MAX_SIZE": 1024},
+            {"DSA_UPLOAD_IMAGE_MAX_PIXELS": 1},
+        ):
+            with self.subTest(**limit), override_settings(**limit), open(
+                image_path, "rb"
+            ) as image:
+                resp = self.client.post(
+                    "/test/test-upload-image-view", data={"image": image}
+                )
+                self.assertEqual(resp.status_code, 422)
+
+    def test_upload_image_pixel_limit_messages(self):
+        image_path = Path(__file__).resolve(strict=True).parent.parent / "Python39.png"
+
+        with override_settings(DSA_UPLOAD_IMAGE_MAX_PIXELS=1), open(
+            image_path, "rb"
+        ) as image:
+            resp = self.client.post(
+                "/test/test-upload-image-view", data={"image": image}
+            )
+        self.assertEqual(resp.status_code, 422)
+        self.assertIn(b"no larger than 1 pixels", resp.content)
+
+        # Pillow's own limit is reported with its own message.
+        with patch.object(Image, "MAX_IMAGE_PIXELS", 1), override_settings(
+            DSA_UPLOAD_IMAGE_MAX_PIXELS=None
+        ), open(image_path, "rb") as image:
+            resp = self.client.post(
+                "/test/test-upload-image-view", data={"image": image}
+            )
+        self.assertEqual(resp.status_code, 422)
+        self.assertIn(b"decompression bomb", resp.content)
+        self.assertNotIn(b"no larger than", resp.content)
@@ -19,4 +19,31 @@ urlpatterns = [
     path("test-common-class-view", views.CommonClassView.as_view()),
     path("test-upload-file-view", views.TestUploadFile.as_view()),
     path("test-upload-image-view", views.TestUploadImage.as_view()),
+    # test async views
+    path("test-async-get-func/<name>", views.async_get_func),
+    path("test-async-view/<id>", views.AsyncView.as_view()),
+    path("test-existing-user", views.get_existing_user),
+    path("test-translated-docs-func", views.translated_docs_func),
+    # test serializing responses
+    path("test-serialize-users", views.serialize_users),
+    path("test-serialize-staff", views.serialize_staff),
+    path("test-async-serialize-user/<id>", views.async_serialize_user),
+    path("test-async-serialize-users", views.async_serialize_users),
+    path("test-serialize-view", views.SerializeView.as_view()),
+    # test caching responses
+    path("test-cached-func", views.cached_func),
+    path("test-cached-view/<id>", views.CachedView.as_view()),
+    path("test-inherited-cached-view/<id>", views.InheritedCachedView.as_view()),
+    path("test-async-cached-func", views.async_cached_func),
+    path("test-cached-template", views.cached_template),
+    path("test-serialize-cached-user/<id>", views.serialize_cached_user),
+    # test conditional responses
+    path("test-conditional-func", views.conditional_func),
+    path("test-conditional-template", views.conditional_template),
+    path("test-conditional-view/<id>", views.ConditionalView.as_view()),
+    path("test-versioned-user/<id>", views.versioned_user),
+    path("test-async-versioned-user/<id>", views.async_versioned_user),
+    path("test-async-versioned-users", views.async_versioned_users),
+    # test streaming responses
+    path("test-stream-users", views.stream_users),
 ]
@@ -1,7 +1,14 @@
+from itertools import count
+from typing import List
+
+from django.contrib.auth.models import User
 from django.http import HttpRequest
 from django.http.response import HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy
 from django.views import View
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 from django_simple_api import (
     Body,
@@ -9,7 +16,12 @@ from django_simple_api import (
     Header,
     Path,
     Query,
+    StreamingJSONResponse,
     allow_request_method,
+    cache_response,
+    conditional_response,
+    describe_response,
+    mark_tags,
     UploadFile,
 )
 from django_simple_api.types import UploadImage
@@ -102,3 +114,187 @@ class TestUploadFile(View):
 class TestUploadImage(View):
     def post(self, request, image: UploadImage = Body()):
         return HttpResponse(image.name)
+
+
+@allow_request_method("get")
+async def async_get_func(request, name: str = Path(), name_id: int = Query()):
+    return HttpResponse(name + str(name_id))
+
+
+@mark_tags(gettext_lazy("Translated"))
+@allow_request_method("get")
+def translated_docs_func(
+    request, id: int = Query(description=gettext_lazy("The ID of the user."))
+):
+    return HttpResponse(id)
+
+
+class AsyncView(View):
+    async def get(self, request, id: int = Path()):
+        return HttpResponse(id)
+
+
+class ExistingUser(BaseModel):
+    username: str
+
+    @validator("username")
+    def check_exists(cls, value):
+        if not User.objects.filter(username=value).exists():
+            raise ValueError("The user does not exist.")
+        return value
+
+
+@allow_request_method("get")
+def get_existing_user(request, user: ExistingUser = Query(exclusive=True)):
+    return HttpResponse(user.username)
+
+
+class UserOut(BaseModel):
+    id: int
+    username: str
+
+
+@allow_request_method("get")
+@describe_response(200, content=List[UserOut], serialize=True)
+def serialize_users(request, username: str = Query()):
+    return User.objects.filter(username=username)
+
+
+class StaffOut(UserOut):
+    is_staff: bool
+
+
+@allow_request_method("get")
+@describe_response(200, content=List[StaffOut], serialize=True)
+def serialize_staff(request):
+    return User.objects.filter(is_staff=True)
+
+
+@allow_request_method("get")
+@describe_response(200, content=UserOut, serialize=True)
+async def async_serialize_user(request, id: int = Path()):
+    return {"id": id, "username": "Zhang", "password": "secret"}
+
+
+@allow_request_method("get")
+@describe_response(200, content=List[UserOut], serialize=True)
+async def async_serialize_users(request, username: str = Query()):
+    return User.objects.filter(username=username)
+
+
+class SerializeView(View):
+    @describe_response(201, content=UserOut, serialize=True)
+    def post(self, request, id: int = Body()):
+        if id < 0:
+            return HttpResponse(status=404)
+        return UserOut(id=id, username="Zhang")
+
+
+calls = count()
+
+
+@cache_response(60, vary_on=["Accept-Language"])
+@allow_request_method("get")
+def cached_func(request, a: int = Query(), b: int = Query()):
+    return HttpResponse(f"{a + b}-{next(calls)}")
+
+
+@cache_response(60)
+class CachedView(View):
+    def get(self, request, id: int = Path()):
+        return HttpResponse(f"{id}-{next(calls)}")
+
+    def post(self, request, id: int = Path()):
+        return HttpResponse(f"{id}-{next(calls)}")
+
+
+@allow_request_method("get")
+@describe_response(200, content=UserOut, serialize=True)
+@cache_response(60)
+def serialize_cached_user(request, id: int = Path()):
+    return {"id": id, "username": f"Zhang-{next(calls)}"}
+
+
+class CountView(View):
+    def get(self, request, id: int = Path()):
+        return HttpResponse(f"{id}-{next(calls)}")
+
+
+@cache_response(60)
+class InheritedCachedView(CountView):
+    pass
+
+
+template = engines["django"].from_string("{{ value }}")
+
+
+@cache_response(60)
+@allow_request_method("get")
+def cached_template(request, a: int = Query()):
+    return TemplateResponse(request, template, {"value": f"{a}-{next(calls)}"})
+
+
+@allow_request_method("get")
+@cache_response(60)
+async def async_cached_func(request, page: QueryPage = Query(exclusive=True)):
+    return HttpResponse(f"{page.size}-{next(calls)}")
+
+
+@conditional_response()
+@allow_request_method("get")
+def conditional_func(request, a: int = Query()):
+    return HttpResponse(a)
+
+
+rendered: List[int] = []
+
+
+def user_version(request, id: int):
+    return {"id": id, "updated": "2021-01-01"}
+
+
+@conditional_response(version=user_version)
+@allow_request_method("get")
+@describe_response(200, content=UserOut, serialize=True)
+def versioned_user(request, id: int = Path()):
+    rendered.append(id)
+    return {"id": id, "username": "Zhang"}
+
+
+async def async_user_version(request, id: int):
+    return id if id > 0 else None
+
+
+@conditional_response(version=async_user_version)
+@allow_request_method("get")
+async def async_versioned_user(request, id: int = Path()):
+    rendered.append(id)
+    return HttpResponse(id)
+
+
+def users_version(request, username: str):
+    return User.objects.filter(username=username).count()
+
+
+@conditional_response(version=users_version)
+@allow_request_method("get")
+async def async_versioned_users(request, username: str = Query()):
+    rendered.append(0)
+    return HttpResponse(username)
+
+
+@conditional_response()
+@allow_request_method("get")
+def conditional_template(request, a: int = Query()):
+    return TemplateResponse(request, template, {"value": a})
+
+
+@conditional_response()
+class ConditionalView(CountView):
+    pass
+
+
+@allow_request_method("get")
+def stream_users(request):
+    users = User.objects.order_by("id").aiter_json(excludes=["password"], chunk_size=1)
+    return StreamingJSONResponse(users, batch_size=1)